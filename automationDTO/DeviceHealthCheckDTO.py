@@ -1,9 +1,13 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Iterable, List, Optional
 from device_details_dto import DeviceDetailsDTO  # Assuming DeviceDetailsDTO is in a separate module
+from json_codec import loads
 
 
 class DeviceHealthCheckDTO(BaseModel):
+    # Let the factories pass field names; without this pydantic ignores them in favour of the aliases.
+    model_config = ConfigDict(populate_by_name=True)
+
     device_details_list: List[DeviceDetailsDTO] = Field(default_factory=list, alias="Device")
     error_code: Optional[str] = None
     success: bool = False
@@ -28,6 +32,22 @@ class DeviceHealthCheckDTO(BaseModel):
 
         raise ValueError("DeviceHealthCheckDTO Missing Values")
 
+    @classmethod
+    def from_api_bytes(cls, body):
+        """Factory method to create an instance from an undecoded response body (bytes or memoryview)."""
+        return cls.from_api_response(loads(body))
+
+    @classmethod
+    def merge(cls, pages: Iterable["DeviceHealthCheckDTO"]):
+        """Combine the per-page DTOs of a paged fetch into a single result."""
+        pages = list(pages)
+        device_details_list = [device for page in pages for device in page.device_details_list]
+        return cls(
+            device_details_list=device_details_list,
+            total=pages[0].total if pages else 0,
+            success=all(page.success for page in pages)
+        )
+
     def get_device_details_list(self) -> List[DeviceDetailsDTO]:
         """Getter for device_details_list."""
         return self.device_details_list
@@ -1,9 +1,13 @@
-from pydantic import BaseModel, Field
-from typing import Dict, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Dict, Iterable, Optional
 from device_search_dto import DeviceSearchDTO  # Assuming DeviceSearchDTO is in a separate module
+from json_codec import loads
 
 
 class DeviceSearchListDTO(BaseModel):
+    # Let the factories pass field names; without this pydantic ignores them in favour of the aliases.
+    model_config = ConfigDict(populate_by_name=True)
+
     device_search_list: Dict[str, DeviceSearchDTO] = Field(default_factory=dict, alias="Devices")
     page: Optional[int] = Field(None, alias="Page")
     page_size: Optional[int] = Field(None, alias="PageSize")
@@ -33,6 +37,26 @@ class DeviceSearchListDTO(BaseModel):
 
         raise ValueError("DeviceSearchListDTO Missing Values")
 
+    @classmethod
+    def from_api_bytes(cls, body):
+        """Factory method to create an instance from an undecoded response body (bytes or memoryview)."""
+        return cls.from_api_response(loads(body))
+
+    @classmethod
+    def merge(cls, pages: Iterable["DeviceSearchListDTO"]):
+        """Combine the per-page DTOs of a paged search into a single result."""
+        pages = list(pages)
+        device_search_list = {}
+        for page in pages:
+            device_search_list.update(page.device_search_list)
+        return cls(
+            device_search_list=device_search_list,
+            page=0,
+            page_size=len(device_search_list),
+            total=pages[0].total if pages else 0,
+            success=all(page.success for page in pages)
+        )
+
     def get_device_search_list(self) -> Dict[str, DeviceSearchDTO]:
         """Getter for device_search_list."""
         return self.device_search_list
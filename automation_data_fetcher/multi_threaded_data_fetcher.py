@@ -20,8 +20,8 @@ class MultiThreadedDataFetcher:
         return response
 
     def fetch_devices(self):
-        response = self.mdm_controller.get_device_health_check("1", 100, 1)
-        return response
+        # Walk every page instead of only the first 100 devices.
+        return list(self.mdm_controller.iter_device_health_check("1"))
 
     def fetch_applications(self):
         response = self.mam_controller.search_application_by_bundle_id("")
@@ -39,26 +39,41 @@ class MultiThreadedDataFetcher:
         response = self.sys_controller.search_custom_user_group_with_params("")
         return response
 
-    def run_parallel_fetch(self):
-        with concurrent.futures.ThreadPoolExecutor() as executor:
+    def run_parallel_fetch(self, deadline=None):
+        # With a Deadline every fetch shares its budget, so the whole run ends within it.
+        bind = deadline.wrap if deadline is not None else (lambda fetch: fetch)
+        executor = concurrent.futures.ThreadPoolExecutor()
+        timed_out = False
+        try:
             futures = {
-                executor.submit(self.fetch_organization_groups): "Organization Groups",
-                executor.submit(self.fetch_devices): "Devices",
-                executor.submit(self.fetch_applications): "Applications",
-                executor.submit(self.fetch_users): "Users",
-                executor.submit(self.fetch_smart_groups): "Smart Groups",
-                executor.submit(self.fetch_user_groups): "User Groups"
+                executor.submit(bind(self.fetch_organization_groups)): "Organization Groups",
+                executor.submit(bind(self.fetch_devices)): "Devices",
+                executor.submit(bind(self.fetch_applications)): "Applications",
+                executor.submit(bind(self.fetch_users)): "Users",
+                executor.submit(bind(self.fetch_smart_groups)): "Smart Groups",
+                executor.submit(bind(self.fetch_user_groups)): "User Groups"
             }
 
             results = {}
-            for future in concurrent.futures.as_completed(futures):
-                category = futures[future]
-                try:
-                    data = future.result()
-                    results[category] = data
-                    self.save_to_chromadb(data, category)
-                except Exception as e:
-                    print(f"{category} generated an exception: {e}")
+            try:
+                for future in concurrent.futures.as_completed(
+                    futures, timeout=deadline.remaining() if deadline is not None else None
+                ):
+                    category = futures[future]
+                    try:
+                        data = future.result()
+                        results[category] = data
+                        self.save_to_chromadb(data, category)
+                    except Exception as e:
+                        print(f"{category} generated an exception: {e}")
+            except concurrent.futures.TimeoutError:
+                timed_out = True
+                for future, category in futures.items():
+                    if not future.done():
+                        print(f"{category} did not finish before the deadline")
+        finally:
+            # After a timeout, return without waiting for the stragglers.
+            executor.shutdown(wait=not timed_out, cancel_futures=timed_out)
         return results
 
     def save_to_chromadb(self, data, category):
@@ -0,0 +1,117 @@
+# handlers/bulk_device_command_handler.py
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+class BulkDeviceCommandHandler:
+    """Runs one device command across thousands of devices.
+
+    Commands the AirWatch bulk endpoint accepts are sent in chunks of
+    ``bulk_chunk_size`` devices per request; the rest fall back to one call
+    per device, fanned out over ``max_workers`` threads.
+    """
+
+    # Commands /mdm/devices/commands/bulk accepts, and the identifiers it can look devices up by.
+    BULK_COMMANDS = {"SyncDevice", "LockDevice", "EnterpriseWipe", "SoftReset"}
+    BULK_SEARCH_BY = {"DeviceId", "Serialnumber", "Udid", "Macaddress", "ImeiNumber"}
+
+    def __init__(self, mdm_rest_controller, bulk_chunk_size=500, max_workers=16):
+        self.mdm_rest_controller = mdm_rest_controller
+        self.bulk_chunk_size = bulk_chunk_size
+        self.max_workers = max_workers
+
+    def _single_device_call(self, command, repetitions=3, gap=10):
+        """Return the per-device controller call for a command."""
+        calls = {
+            "DeviceWipe": self.mdm_rest_controller.device_wipe_by_serial_number,
+            "FindDevice": lambda serial: self.mdm_rest_controller.find_device_by_serial_number(serial, repetitions, gap),
+            "ClearPasscode": self.mdm_rest_controller.clear_device_passcode,
+        }
+        if command not in calls:
+            raise ValueError(f"Unsupported device command: {command}")
+        return calls[command]
+
+    def _run_bulk_chunk(self, command, search_by, chunk):
+        """Send one bulk request and turn its fault list into per-device results."""
+        try:
+            response = self.mdm_rest_controller.bulk_device_command(command, search_by, chunk) or {}
+        except Exception as e:
+            logging.error(f"Bulk {command} failed for {len(chunk)} devices: {e}")
+            return [{"device": device, "status": "failed", "error": str(e)} for device in chunk]
+        faults = {
+            str(fault.get("ItemValue")): fault.get("Message") or fault.get("ErrorCode")
+            for fault in (response.get("Faults") or {}).get("Fault", [])
+        }
+        return [
+            {"device": device, "status": "failed", "error": faults[str(device)]} if str(device) in faults
+            else {"device": device, "status": "success"}
+            for device in chunk
+        ]
+
+    def _run_single(self, call, device):
+        try:
+            return {"device": device, "status": "success", "response": call(device)}
+        except Exception as e:
+            return {"device": device, "status": "failed", "error": str(e)}
+
+    def run_command(self, command, devices, search_by="Serialnumber", repetitions=3, gap=10):
+        """Run a command on every device and return per-device results plus throughput stats.
+
+        For bulk commands (including SoftReset) ``devices`` are identifiers of
+        the kind named by ``search_by``: DeviceId, Serialnumber, Udid,
+        Macaddress or ImeiNumber. Other commands use the per-device controller
+        methods: DeviceWipe and FindDevice take serial numbers, ClearPasscode
+        takes device IDs.
+        """
+        if command in self.BULK_COMMANDS and search_by not in self.BULK_SEARCH_BY:
+            raise ValueError(f"Unsupported search_by for bulk commands: {search_by}")
+        devices = list(devices)
+        started = time.monotonic()
+        results = []
+        # Each task runs in a copy of the caller's context so it keeps the caller's Deadline.
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            if command in self.BULK_COMMANDS:
+                chunks = [devices[i:i + self.bulk_chunk_size] for i in range(0, len(devices), self.bulk_chunk_size)]
+                futures = [
+                    executor.submit(contextvars.copy_context().run, self._run_bulk_chunk, command, search_by, chunk)
+                    for chunk in chunks
+                ]
+                for future in as_completed(futures):
+                    results.extend(future.result())
+                request_count = len(chunks)
+            else:
+                call = self._single_device_call(command, repetitions, gap)
+                futures = [
+                    executor.submit(contextvars.copy_context().run, self._run_single, call, device)
+                    for device in devices
+                ]
+                for future in as_completed(futures):
+                    results.append(future.result())
+                request_count = len(devices)
+
+        elapsed = time.monotonic() - started
+        succeeded = sum(1 for result in results if result["status"] == "success")
+        stats = {
+            "command": command,
+            "devices": len(devices),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "requests": request_count,
+            "elapsed_seconds": elapsed,
+            "devices_per_second": len(devices) / elapsed if elapsed else 0.0,
+        }
+        logging.info(f"{command}: {succeeded}/{len(devices)} devices succeeded in {elapsed:.1f}s")
+        return {"results": results, "stats": stats}
+
+# Example usage
+if __name__ == "__main__":
+    from mdm_rest_controller import MDMRestController
+
+    mdm_controller = MDMRestController(apiurl="https://api.airwatch.com", tenant="your-tenant", authorization="Bearer Token")
+    handler = BulkDeviceCommandHandler(mdm_controller)
+    outcome = handler.run_command("SyncDevice", ["SN123456789", "SN987654321"])
+    print(outcome["stats"])
+    for result in outcome["results"]:
+        print(result)
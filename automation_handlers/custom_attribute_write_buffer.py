@@ -0,0 +1,95 @@
+# handlers/custom_attribute_write_buffer.py
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class CustomAttributeWriteBuffer:
+    """Coalesces custom attribute updates into one PUT per device.
+
+    Updates added with ``add`` are merged per device (a later value for the
+    same attribute in the same application group replaces the earlier one). Pending updates are flushed
+    when ``max_pending_devices`` devices are waiting, every
+    ``flush_interval`` seconds from a background thread, and on ``close``.
+    Each flush sends its PUTs in parallel over ``max_workers`` threads.
+    """
+
+    def __init__(self, mdm_rest_controller, max_pending_devices=500, flush_interval=2.0, max_workers=16):
+        self.mdm_rest_controller = mdm_rest_controller
+        self.max_pending_devices = max_pending_devices
+        self.flush_interval = flush_interval
+        self.results = []
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._stopped = threading.Event()
+        self._timer = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._timer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add(self, device_id, attribute_name, value, app_group):
+        """Queue one attribute update for a device."""
+        with self._lock:
+            attributes = self._pending.setdefault(device_id, {})
+            attributes[(app_group, attribute_name)] = {"Name": attribute_name, "Value": value, "ApplicationGroup": app_group}
+            full = len(self._pending) >= self.max_pending_devices
+        if full:
+            self.flush()
+
+    def _write(self, device_id, attributes):
+        try:
+            self.mdm_rest_controller.update_device_custom_attributes(device_id, attributes)
+            return {"device_id": device_id, "attributes": len(attributes), "status": "success"}
+        except Exception as e:
+            logging.error(f"Error updating custom attributes for device {device_id}: {e}")
+            return {"device_id": device_id, "attributes": len(attributes), "status": "failed", "error": str(e)}
+
+    def flush(self):
+        """Send every pending device's updates in parallel and return their per-device results."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return []
+            futures = [
+                self._executor.submit(
+                    contextvars.copy_context().run, self._write, device_id, list(attributes.values())
+                )
+                for device_id, attributes in pending.items()
+            ]
+            batch_results = [future.result() for future in futures]
+            with self._lock:
+                self.results.extend(batch_results)
+            logging.info(f"Flushed custom attributes for {len(batch_results)} devices.")
+            return batch_results
+
+    def _flush_periodically(self):
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        """Stop the background flusher, flush what is left and return every result."""
+        self._stopped.set()
+        self._timer.join()
+        self.flush()
+        self._executor.shutdown()
+        return self.results
+
+# Example usage
+if __name__ == "__main__":
+    from mdm_rest_controller import MDMRestController
+
+    mdm_controller = MDMRestController(apiurl="https://api.airwatch.com", tenant="your-tenant", authorization="Bearer Token")
+    with CustomAttributeWriteBuffer(mdm_controller) as buffer:
+        for device_id in ["12345", "67890"]:
+            buffer.add(device_id, "Site", "HQ", "com.example.attributes")
+            buffer.add(device_id, "Region", "EMEA", "com.example.attributes")
+    for result in buffer.results:
+        print(result)
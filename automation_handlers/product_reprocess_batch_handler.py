@@ -0,0 +1,49 @@
+# handlers/product_reprocess_batch_handler.py
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ProductReprocessBatchHandler:
+    """Reprocesses a product across many devices with a few chunked calls."""
+
+    def __init__(self, mdm_rest_controller, chunk_size=500, max_workers=4):
+        self.mdm_rest_controller = mdm_rest_controller
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+
+    def _reprocess_chunk(self, product_id, chunk):
+        try:
+            response = self.mdm_rest_controller.reprocess_product_for_devices(chunk, product_id)
+            return {"device_ids": chunk, "status": "success", "response": response}
+        except Exception as e:
+            logging.error(f"Error reprocessing product {product_id} on {len(chunk)} devices: {e}")
+            return {"device_ids": chunk, "status": "failed", "error": str(e)}
+
+    def reprocess(self, product_id, device_ids):
+        """Reprocess a product on every device, sending chunk_size devices per request concurrently."""
+        device_ids = list(device_ids)
+        chunks = [device_ids[i:i + self.chunk_size] for i in range(0, len(device_ids), self.chunk_size)]
+        # Workers run in copies of the caller's context so they keep its Deadline.
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(
+                lambda chunk: context.copy().run(self._reprocess_chunk, product_id, chunk), chunks
+            ))
+        failed = sum(len(result["device_ids"]) for result in results if result["status"] == "failed")
+        logging.info(f"Reprocessed product {product_id} on {len(device_ids) - failed}/{len(device_ids)} devices "
+                     f"in {len(chunks)} requests.")
+        return results
+
+    def reprocess_failed(self, product_id, device_failed_product_dto):
+        """Reprocess a product on every device listed in a DeviceFailedProductDTO."""
+        return self.reprocess(product_id, device_failed_product_dto.device_failed_product_list.keys())
+
+# Example usage
+if __name__ == "__main__":
+    from mdm_rest_controller import MDMRestController
+
+    mdm_controller = MDMRestController(apiurl="https://api.airwatch.com", tenant="your-tenant", authorization="Bearer Token")
+    handler = ProductReprocessBatchHandler(mdm_controller)
+    for result in handler.reprocess("42", ["12345", "67890"]):
+        print(result["status"], len(result["device_ids"]))
@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+import threading
+
+
+def sha256_of_file(file_path, block_size=1024 * 1024):
+    """Hash a file in fixed-size blocks so large APKs are never fully loaded."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class BlobRegistry:
+    """Local content-addressed registry of uploaded application blobs.
+
+    Maps the SHA-256 of an APK to the blob ID it was uploaded as, plus its
+    bundle ID and version, and persists the mapping to a JSON file so later
+    deployment runs can skip re-uploading identical binaries.
+    """
+
+    def __init__(self, registry_path="./blob_registry.json"):
+        self.registry_path = registry_path
+        self._lock = threading.Lock()
+        self._records = {}
+        if os.path.exists(registry_path):
+            with open(registry_path) as registry_file:
+                self._records = json.load(registry_file)
+
+    def get(self, sha256):
+        """Return the record for a content hash, or None."""
+        with self._lock:
+            return self._records.get(sha256)
+
+    def put(self, sha256, blob_id, bundle_id, version):
+        """Record an uploaded blob and persist the registry."""
+        with self._lock:
+            self._records[sha256] = {"blob_id": blob_id, "bundle_id": bundle_id, "version": version}
+            self._save()
+
+    def forget(self, sha256):
+        """Drop a record, e.g. after its application was deleted on the server."""
+        with self._lock:
+            if self._records.pop(sha256, None) is not None:
+                self._save()
+
+    def _save(self):
+        tmp_path = f"{self.registry_path}.tmp"
+        with open(tmp_path, "w") as registry_file:
+            json.dump(self._records, registry_file, indent=2)
+        os.replace(tmp_path, self.registry_path)
+
+    @staticmethod
+    def _find_application(mam_controller, bundle_id, version):
+        """Return the server's application for bundle_id at version, or None."""
+        response = mam_controller.search_application_by_bundle_id(bundle_id) or {}
+        for application in response.get("Application", []):
+            if application.get("BundleId") == bundle_id and application.get("AppVersion") == version:
+                return application
+        return None
+
+    def upload_blob_once(self, mam_controller, filename, apk_file_path, module_type, organization_group_id,
+                         bundle_id, version):
+        """Upload an APK unless an identical binary is already registered and present on the server.
+
+        Returns a dict with ``blob_id``, ``application_id`` (set when the
+        application already exists, so the caller can go straight to
+        assignment) and ``uploaded``.
+        """
+        sha256 = sha256_of_file(apk_file_path)
+        record = self.get(sha256)
+        if record is not None:
+            application = self._find_application(mam_controller, record["bundle_id"], record["version"])
+            if application is not None:
+                return {
+                    "blob_id": record["blob_id"],
+                    "application_id": application.get("Id", {}).get("Value"),
+                    "uploaded": False,
+                }
+            self.forget(sha256)
+
+        response = mam_controller.upload_blob(filename, apk_file_path, module_type, organization_group_id)
+        blob_id = response.get("Value")
+        self.put(sha256, blob_id, bundle_id, version)
+        return {"blob_id": blob_id, "application_id": None, "uploaded": True}
@@ -0,0 +1,149 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+IDENTIFIER_COLUMNS = ("serial_number", "udid", "imei", "mac_address")
+
+
+def _normalize(column, value):
+    """Normalize an identifier so lookups ignore case and MAC separators."""
+    if value in (None, ""):
+        return None
+    value = str(value).strip().lower()
+    if column == "mac_address":
+        value = value.replace(":", "").replace("-", "").replace(".", "")
+    return value
+
+
+def _device_id_of(record):
+    device_id = record.get("Id")
+    return str(device_id.get("Value") if isinstance(device_id, dict) else device_id)
+
+
+class DeviceIndex:
+    """Persistent local index from serial number, UDID, IMEI and MAC address to device ID.
+
+    Backed by SQLite so it survives between runs. Bulk-load it from
+    /mdm/devices/search pages or DeviceSearchListDTOs, keep it fresh with
+    ``refresh``, and resolve identifiers locally instead of calling
+    ``retrieve_device_information`` for every device.
+    """
+
+    def __init__(self, db_path="./device_index.db"):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS devices (device_id TEXT PRIMARY KEY, serial_number TEXT, udid TEXT, "
+                "imei TEXT, mac_address TEXT, updated_at REAL)"
+            )
+            for column in IDENTIFIER_COLUMNS:
+                self._connection.execute(f"CREATE INDEX IF NOT EXISTS devices_{column} ON devices ({column})")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _upsert_rows(self, rows):
+        now = time.time()
+        with self._lock, self._connection:
+            for device_id, *identifiers in rows:
+                # A re-enrolled device gets a new ID; drop the old record that still claims its identifiers.
+                for column, value in zip(IDENTIFIER_COLUMNS, identifiers):
+                    if value is not None:
+                        self._connection.execute(
+                            f"DELETE FROM devices WHERE {column} = ? AND device_id != ?", (value, device_id)
+                        )
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO devices VALUES (?, ?, ?, ?, ?, ?)", (device_id, *identifiers, now)
+                )
+
+    def add(self, device_id, serial_number=None, udid=None, imei=None, mac_address=None):
+        """Record (or replace) the identifiers of one device."""
+        identifiers = dict(zip(IDENTIFIER_COLUMNS, (serial_number, udid, imei, mac_address)))
+        self._upsert_rows([(str(device_id), *(_normalize(c, v) for c, v in identifiers.items()))])
+
+    def add_records(self, records):
+        """Record raw device dicts as returned by /mdm/devices/search or retrieve_device_information."""
+        self._upsert_rows([
+            (
+                _device_id_of(record),
+                _normalize("serial_number", record.get("SerialNumber")),
+                _normalize("udid", record.get("Udid")),
+                _normalize("imei", record.get("Imei")),
+                _normalize("mac_address", record.get("MacAddress")),
+            )
+            for record in records
+        ])
+
+    def load_search_list(self, device_search_list_dto):
+        """Record every device in a DeviceSearchListDTO page (or merged result)."""
+        self._upsert_rows([
+            (
+                str(device_id),
+                _normalize("serial_number", device.serial_number),
+                _normalize("udid", device.udid),
+                _normalize("imei", device.imei),
+                _normalize("mac_address", device.mac_address),
+            )
+            for device_id, device in device_search_list_dto.device_search_list.items()
+        ])
+
+    def bulk_load(self, mdm_rest_controller, page_size=500, max_concurrency=8, **filters):
+        """Load the whole fleet, fetching search pages concurrently; returns the number of devices seen."""
+        started = datetime.now(timezone.utc)
+        count = 0
+        for page in mdm_rest_controller.fetch_device_search_pages(page_size, max_concurrency, False, **filters):
+            devices = page.get("Devices") or []
+            self.add_records(devices)
+            count += len(devices)
+        self._set_meta("last_sync", started.strftime("%Y-%m-%d %H:%M:%S"))
+        return count
+
+    def refresh(self, mdm_rest_controller, page_size=500):
+        """Re-index devices seen since the last bulk_load/refresh; falls back to a full load."""
+        last_sync = self._get_meta("last_sync")
+        if last_sync is None:
+            return self.bulk_load(mdm_rest_controller, page_size)
+        started = datetime.now(timezone.utc)
+        count = 0
+        for page in mdm_rest_controller.fetch_device_search_pages(page_size, seensince=last_sync):
+            devices = page.get("Devices") or []
+            self.add_records(devices)
+            count += len(devices)
+        self._set_meta("last_sync", started.strftime("%Y-%m-%d %H:%M:%S"))
+        return count
+
+    def resolve(self, serial_number=None, udid=None, imei=None, mac_address=None):
+        """Return the device ID for the first identifier given that is indexed, else None."""
+        for column, value in zip(IDENTIFIER_COLUMNS, (serial_number, udid, imei, mac_address)):
+            value = _normalize(column, value)
+            if value is None:
+                continue
+            with self._lock:
+                row = self._connection.execute(
+                    f"SELECT device_id FROM devices WHERE {column} = ? ORDER BY updated_at DESC LIMIT 1", (value,)
+                ).fetchone()
+            if row is not None:
+                return row[0]
+        return None
+
+    def remove(self, device_id):
+        """Forget a device, e.g. after its record was deleted."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM devices WHERE device_id = ?", (str(device_id),))
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM devices").fetchone()[0]
+
+    def _get_meta(self, key):
+        with self._lock:
+            row = self._connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def close(self):
+        self._connection.close()
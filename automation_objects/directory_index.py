@@ -0,0 +1,108 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from directory_keys import USER, USER_GROUP, user_group_id
+
+
+class DirectoryIndex:
+    """Name -> ID lookup cache for enrollment users and custom user groups.
+
+    A size-bounded in-memory LRU sits in front of a SQLite table that
+    persists positive entries between runs. Names that were looked up and
+    not found are remembered in memory for ``negative_ttl`` seconds so a
+    CSV full of unknown names costs at most one lookup per name. Names are
+    matched case-insensitively.
+    """
+
+    def __init__(self, db_path="./directory_index.db", max_memory_entries=10000, negative_ttl=300):
+        self.max_memory_entries = max_memory_entries
+        self.negative_ttl = negative_ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS directory (kind TEXT, name TEXT, id TEXT, PRIMARY KEY (kind, name))"
+            )
+
+    def _remember(self, key, value):
+        """Store in the memory LRU; value is an ID or (None, expires_at) for a negative entry."""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, kind, name):
+        """Return ``(True, id)`` for a known name, ``(True, None)`` for a cached miss, else ``(False, None)``."""
+        key = (kind, name.lower())
+        with self._lock:
+            value = self._memory.get(key)
+            if isinstance(value, tuple):
+                if value[1] > time.monotonic():
+                    self._memory.move_to_end(key)
+                    return True, None
+                del self._memory[key]
+            elif value is not None:
+                self._memory.move_to_end(key)
+                return True, value
+            row = self._connection.execute(
+                "SELECT id FROM directory WHERE kind = ? AND name = ?", key
+            ).fetchone()
+            if row is None:
+                return False, None
+            self._remember(key, row[0])
+            return True, row[0]
+
+    def put(self, kind, name, entry_id):
+        self.put_many(kind, [(name, entry_id)])
+
+    def put_many(self, kind, entries):
+        """Record (name, id) pairs in memory and on disk."""
+        rows = [(kind, name.lower(), str(entry_id)) for name, entry_id in entries]
+        with self._lock, self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO directory VALUES (?, ?, ?)", rows)
+            for kind_, name, entry_id in rows:
+                self._remember((kind_, name), entry_id)
+
+    def put_missing(self, kind, name):
+        """Remember that a name does not exist, for negative_ttl seconds."""
+        with self._lock:
+            self._remember((kind, name.lower()), (None, time.monotonic() + self.negative_ttl))
+
+    def invalidate(self, kind, name=None):
+        """Forget one name, or every entry of a kind when name is None."""
+        with self._lock, self._connection:
+            if name is None:
+                for key in [key for key in self._memory if key[0] == kind]:
+                    del self._memory[key]
+                self._connection.execute("DELETE FROM directory WHERE kind = ?", (kind,))
+            else:
+                key = (kind, name.lower())
+                self._memory.pop(key, None)
+                self._connection.execute("DELETE FROM directory WHERE kind = ? AND name = ?", key)
+
+    def warm_users(self, sys_rest_controller, page_size=500):
+        """Prefetch every enrollment user; returns the number indexed."""
+        count = 0
+        batch = []
+        for user in sys_rest_controller.iter_enrollment_users("", page_size):
+            batch.append((user["UserName"], user["Id"]["Value"]))
+            if len(batch) >= page_size:
+                self.put_many(USER, batch)
+                count += len(batch)
+                batch = []
+        self.put_many(USER, batch)
+        return count + len(batch)
+
+    def warm_user_groups(self, sys_rest_controller):
+        """Prefetch every custom user group; returns the number indexed."""
+        groups = [
+            (group["UserGroupName"], user_group_id(group)) for group in sys_rest_controller.iter_custom_user_groups()
+        ]
+        self.put_many(USER_GROUP, groups)
+        return len(groups)
+
+    def close(self):
+        self._connection.close()
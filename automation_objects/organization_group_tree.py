@@ -0,0 +1,159 @@
+import contextvars
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _og_id(record):
+    og_id = record.get("Id")
+    return str(og_id.get("Value") if isinstance(og_id, dict) else og_id)
+
+
+class OrganizationGroupTree:
+    """Indexed in-memory copy of the organization group hierarchy.
+
+    ``crawl`` walks the hierarchy breadth first, fetching the children of
+    every OG on a level concurrently. The result is indexed by ID, GroupId,
+    name and path ("Global/Region/Site") so name/ID resolution and
+    ancestor/descendant queries need no API calls. The tree is considered
+    stale ``ttl`` seconds after it was crawled and can be saved to and
+    loaded from a JSON file.
+    """
+
+    def __init__(self, ttl=3600):
+        self.ttl = ttl
+        self.crawled_at = 0.0
+        self.root_id = None
+        self.nodes = {}
+        self._by_group_id = {}
+        self._by_name = {}
+        self._by_path = {}
+
+    @staticmethod
+    def _node(record, parent_id):
+        return {
+            "id": _og_id(record),
+            "group_id": record.get("GroupId"),
+            "name": record.get("Name"),
+            "uuid": record.get("Uuid"),
+            "type": record.get("LocationGroupType"),
+            "parent_id": parent_id,
+            "children": [],
+        }
+
+    def crawl(self, sys_rest_controller, root_id, max_workers=8):
+        """Fetch the hierarchy under root_id level by level and rebuild the indexes."""
+        root = self._node(sys_rest_controller.get_organization_group(root_id) or {"Id": root_id}, None)
+        nodes = {root["id"]: root}
+        frontier = [root["id"]]
+        # Workers run in copies of the caller's context so they keep its Deadline.
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while frontier:
+                next_frontier = []
+                responses = executor.map(
+                    lambda parent_id: context.copy().run(
+                        sys_rest_controller.get_children_organization_groups_from_parent, parent_id
+                    ),
+                    frontier,
+                )
+                for parent_id, children in zip(frontier, responses):
+                    for record in children or []:
+                        node = self._node(record, parent_id)
+                        if node["id"] in nodes:
+                            continue
+                        nodes[node["id"]] = node
+                        nodes[parent_id]["children"].append(node["id"])
+                        next_frontier.append(node["id"])
+                frontier = next_frontier
+        self._set_nodes(root["id"], nodes, time.time())
+        return self
+
+    def _set_nodes(self, root_id, nodes, crawled_at):
+        self.root_id = root_id
+        self.nodes = nodes
+        self.crawled_at = crawled_at
+        self._by_group_id = {node["group_id"]: og_id for og_id, node in nodes.items() if node["group_id"]}
+        self._by_name = {}
+        for og_id, node in nodes.items():
+            if node["name"]:
+                self._by_name.setdefault(node["name"].lower(), []).append(og_id)
+        self._by_path = {self.path(og_id).lower(): og_id for og_id in nodes}
+
+    def is_stale(self):
+        return time.time() - self.crawled_at > self.ttl
+
+    def get(self, og_id):
+        return self.nodes.get(str(og_id))
+
+    def find_by_group_id(self, group_id):
+        return self.nodes.get(self._by_group_id.get(group_id))
+
+    def find_by_name(self, name):
+        """Return every OG with this name (names are not unique across the tree)."""
+        return [self.nodes[og_id] for og_id in self._by_name.get(name.lower(), [])]
+
+    def find_by_path(self, path):
+        return self.nodes.get(self._by_path.get(path.strip("/").lower()))
+
+    def resolve(self, name_or_group_id):
+        """Resolve a GroupId or a unique name to an OG ID, or None."""
+        node = self.find_by_group_id(name_or_group_id)
+        if node is not None:
+            return node["id"]
+        matches = self.find_by_name(name_or_group_id)
+        return matches[0]["id"] if len(matches) == 1 else None
+
+    def ancestors(self, og_id):
+        """Return the OG's ancestors, nearest first."""
+        result = []
+        node = self.get(og_id)
+        while node is not None and node["parent_id"] is not None:
+            node = self.nodes[node["parent_id"]]
+            result.append(node)
+        return result
+
+    def descendants(self, og_id):
+        """Return every OG below og_id, breadth first."""
+        result = []
+        queue = deque(self.nodes[str(og_id)]["children"])
+        while queue:
+            node = self.nodes[queue.popleft()]
+            result.append(node)
+            queue.extend(node["children"])
+        return result
+
+    def path(self, og_id):
+        """Return the OG's "Global/Region/Site" path, or None if it is not in the tree."""
+        node = self.get(og_id)
+        if node is None:
+            return None
+        names = [ancestor["name"] or ancestor["id"] for ancestor in reversed(self.ancestors(og_id))]
+        return "/".join(names + [node["name"] or node["id"]])
+
+    def save(self, file_path):
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, "w") as tree_file:
+            json.dump({"root_id": self.root_id, "crawled_at": self.crawled_at, "nodes": self.nodes}, tree_file)
+        os.replace(tmp_path, file_path)
+
+    @classmethod
+    def load(cls, file_path, ttl=3600):
+        with open(file_path) as tree_file:
+            data = json.load(tree_file)
+        tree = cls(ttl)
+        tree._set_nodes(data["root_id"], data["nodes"], data["crawled_at"])
+        return tree
+
+    @classmethod
+    def load_or_crawl(cls, sys_rest_controller, root_id, file_path, ttl=3600, max_workers=8):
+        """Load the tree from file_path if it is still fresh, otherwise crawl and save it."""
+        if os.path.exists(file_path):
+            tree = cls.load(file_path, ttl)
+            if not tree.is_stale() and tree.root_id == str(root_id):
+                return tree
+        tree = cls(ttl).crawl(sys_rest_controller, root_id, max_workers)
+        tree.save(file_path)
+        return tree
@@ -0,0 +1,53 @@
+"""Compare calls/sec for one-shot requests.request() calls against the pooled RestClient.
+
+Usage: python benchmarks/bench_connection_pooling.py [calls] [threads]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rest_controllers"))
+
+from mdm_rest_controller import MDMRestController  # noqa: E402
+from stub_server import start_stub_server  # noqa: E402
+
+
+def unpooled_call(apiurl):
+    """Reproduce the controllers' original per-call request path."""
+    headers = {
+        "Authorization": "Bearer token",
+        "aw-tenant-code": "tenant",
+        "Content-Type": "application/json",
+    }
+    response = requests.request("GET", f"{apiurl}/mdm/products/1", headers=headers)
+    response.raise_for_status()
+    return response.json()
+
+
+def measure(label, call, calls, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in executor.map(lambda _: call(), range(calls)):
+            pass
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {calls} calls / {threads} threads: {elapsed:.2f}s, {calls / elapsed:.0f} calls/sec")
+    return calls / elapsed
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    server = start_stub_server()
+    controller = MDMRestController(apiurl=server.url, tenant="tenant", authorization="Bearer token")
+
+    before = measure("unpooled", lambda: unpooled_call(server.url), calls, threads)
+    after = measure("pooled", lambda: controller.get_product_info(1), calls, threads)
+    print(f"speedup: {after / before:.2f}x")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""End-to-end benchmarks for the controllers, DTO parsing and batch handlers.
+
+Each case runs in its own subprocess against a local stub server (see
+stub_server.py) so its peak RSS is measured in isolation. Results are
+compared with benchmarks/baselines.json and the run exits non-zero when a
+case is slower or larger than its baseline by more than the tolerance.
+
+Usage:
+    python benchmarks/run_benchmarks.py                      # run all cases, compare to baselines
+    python benchmarks/run_benchmarks.py health_check_paging  # run selected cases
+    python benchmarks/run_benchmarks.py --save-baseline      # record the current results as the baseline
+"""
+import argparse
+import csv
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+BASELINES_PATH = os.path.join(BENCHMARKS_DIR, "baselines.json")
+
+for module_dir in ("rest_controllers", "automationDTO", "automation_handlers", "automation_data_fetcher",
+                   "automation_objects"):
+    sys.path.insert(0, os.path.join(REPO_DIR, module_dir))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from stub_server import Fleet, StubConfig, start_stub_server  # noqa: E402
+
+
+class SkipCase(Exception):
+    """Raised by a case whose code path cannot be exercised in this tree."""
+
+
+def _controllers(server):
+    from mam_rest_controller import MAMRestController
+    from mdm_rest_controller import MDMRestController
+    from sys_rest_controller import SYSRestController
+
+    arguments = {"apiurl": server.url, "tenant": "bench", "authorization": "Basic YmVuY2g6YmVuY2g="}
+    return MDMRestController(**arguments), SYSRestController(**arguments), MAMRestController(**arguments)
+
+
+def _import(module_name, attribute):
+    """Import a name for a case, turning a broken import into a skip that reports the error."""
+    try:
+        module = __import__(module_name)
+    except Exception as e:
+        raise SkipCase(f"cannot import {module_name}: {type(e).__name__}: {e}")
+    if not hasattr(module, attribute):
+        raise SkipCase(f"{module_name} has no {attribute}")
+    return getattr(module, attribute)
+
+
+def _timed(function, latencies):
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - started)
+    return wrapper
+
+
+def bench_health_check_paging(scale):
+    """Page through get_device_health_check for the whole fleet; one op is one device record."""
+    fleet_size, page_size = 50000 * scale, 500
+    server = start_stub_server(fleet_size=fleet_size)
+    mdm_controller, _, _ = _controllers(server)
+    latencies = []
+    get_page = _timed(mdm_controller.get_device_health_check, latencies)
+    records, page = 0, 0
+    while True:
+        batch = get_page("1", page_size, page).get("Device") or []
+        records += len(batch)
+        if len(batch) < page_size:
+            break
+        page += 1
+    server.shutdown()
+    return records, latencies
+
+
+def bench_device_search_dto(scale):
+    """Parse a 100k-device search response with DeviceSearchListDTO; one op is one device."""
+    device_search_list_dto = _import("DeviceSearchListDTO", "DeviceSearchListDTO")
+    device_count = 100000 * scale
+    fleet = Fleet(StubConfig(fleet_size=device_count))
+    response = {"Devices": [fleet.device(i) for i in range(1, device_count + 1)], "Page": 0,
+                "PageSize": device_count, "Total": device_count}
+    latencies = []
+    parse = _timed(device_search_list_dto.from_api_response, latencies)
+    for _ in range(3):
+        parse(response)
+    return 3 * device_count, latencies
+
+
+def bench_smart_group_batch(scale):
+    """Run SmartGroupBatchHandler.process_smart_group_batch over 10k CSV rows; one op is one row."""
+    smart_group_batch_handler = _import("smart_group_batch_handler", "SmartGroupBatchHandler")
+    row_count = 10000 * scale
+    server = start_stub_server()
+    _, sys_controller, _ = _controllers(server)
+    handler = smart_group_batch_handler(retry_delay=0)
+    handler.sys_rest_controller = sys_controller
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", newline="", delete=False) as csv_file:
+        writer = csv.DictWriter(csv_file, ["group_name", "description", "organization_group_id", "platform",
+                                           "criteria_type"])
+        writer.writeheader()
+        for row in range(row_count):
+            writer.writerow({"group_name": f"bench-{row}", "description": "benchmark", "organization_group_id": 1,
+                             "platform": "Android", "criteria_type": "All"})
+    handler.load_smart_groups_from_csv(csv_file.name)
+    os.unlink(csv_file.name)
+    latencies = []
+    sys_controller.create_smart_group = _timed(sys_controller.create_smart_group, latencies)
+    results = handler.process_smart_group_batch()
+    server.shutdown()
+    return len(results), latencies
+
+
+def bench_parallel_fetch(scale):
+    """Run MultiThreadedDataFetcher.run_parallel_fetch against the stub; one op is one full fetch."""
+    multi_threaded_data_fetcher = _import("multi_threaded_data_fetcher", "MultiThreadedDataFetcher")
+    server = start_stub_server(fleet_size=10000 * scale)
+    fetcher = multi_threaded_data_fetcher(*_controllers(server))
+    latencies = []
+    run = _timed(fetcher.run_parallel_fetch, latencies)
+    for _ in range(5):
+        run()
+    server.shutdown()
+    return len(latencies), latencies
+
+
+CASES = {
+    "health_check_paging": bench_health_check_paging,
+    "device_search_dto": bench_device_search_dto,
+    "smart_group_batch": bench_smart_group_batch,
+    "parallel_fetch": bench_parallel_fetch,
+}
+
+
+def _percentile(values, quantile):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(name, scale):
+    """Run one case in this process and return its result dict."""
+    started = time.perf_counter()
+    try:
+        ops, latencies = CASES[name](scale)
+    except SkipCase as e:
+        return {"case": name, "status": "skipped", "reason": str(e)}
+    elapsed = time.perf_counter() - started
+    return {
+        "case": name,
+        "status": "ok",
+        "scale": scale,
+        "ops": ops,
+        "seconds": round(elapsed, 3),
+        "ops_per_sec": round(ops / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3) if latencies else None,
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 3) if latencies else None,
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3) if latencies else None,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def run_isolated(name, scale):
+    """Run one case in a fresh interpreter (in a scratch directory) so peak RSS covers only that case."""
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", name, "--scale", str(scale)],
+            cwd=scratch_dir, capture_output=True, text=True,
+        )
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        return {"case": name, "status": "failed", "reason": (completed.stderr.strip().splitlines() or ["no output"])[-1]}
+    return json.loads(lines[-1])
+
+
+def compare(result, baseline, tolerance):
+    """Return a list of regressions of a result against its baseline."""
+    regressions = []
+    if result.get("status") != "ok" or not baseline or baseline.get("scale", 1) != result["scale"]:
+        return regressions
+    if result["ops_per_sec"] < baseline["ops_per_sec"] * (1 - tolerance):
+        regressions.append(f"ops/sec {result['ops_per_sec']} < baseline {baseline['ops_per_sec']}")
+    for metric in ("p95_ms", "p99_ms", "peak_rss_mb"):
+        if result.get(metric) is not None and baseline.get(metric) is not None \
+                and result[metric] > baseline[metric] * (1 + tolerance):
+            regressions.append(f"{metric} {result[metric]} > baseline {baseline[metric]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cases", nargs="*", help="cases to run (default: all)")
+    parser.add_argument("--scale", type=int, default=1, help="multiply every case's data size")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to baselines.json")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_case(args.child, args.scale)))
+        return 0
+
+    baselines = {}
+    if os.path.exists(BASELINES_PATH):
+        with open(BASELINES_PATH) as baselines_file:
+            baselines = json.load(baselines_file)
+
+    failed = False
+    results = {}
+    print(f"{'case':<22} {'ops/sec':>12} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'rss MB':>8}")
+    unknown = set(args.cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))} (choose from {', '.join(CASES)})")
+    for name in args.cases or list(CASES):
+        result = results[name] = run_isolated(name, args.scale)
+        if result["status"] != "ok":
+            print(f"{name:<22} {result['status']}: {result['reason']}")
+            failed = failed or result["status"] == "failed"
+            continue
+        print(f"{name:<22} {result['ops_per_sec']:>12} {result['p50_ms']:>10} {result['p95_ms']:>10} "
+              f"{result['p99_ms']:>10} {result['peak_rss_mb']:>8}")
+        for regression in compare(result, baselines.get(name), args.tolerance):
+            print(f"  REGRESSION: {regression}")
+            failed = True
+
+    if args.save_baseline:
+        for name, result in results.items():
+            if result["status"] == "ok":
+                baselines[name] = {key: result[key] for key in ("scale", "ops_per_sec", "p50_ms", "p95_ms",
+                                                                "p99_ms", "peak_rss_mb")}
+        with open(BASELINES_PATH, "w") as baselines_file:
+            json.dump(baselines, baselines_file, indent=2, sort_keys=True)
+            baselines_file.write("\n")
+        print(f"Baselines written to {BASELINES_PATH}")
+        return 0
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,464 @@
+"""Local stand-in for the AirWatch REST API used by the controllers.
+
+Serves the /mdm, /mam and /system endpoints the controllers call from a
+synthetic fleet of configurable size, with optional injected latency, 429s
+and 5xx errors. It can also proxy to a real tenant while recording every
+response, and replay a recording offline.
+
+Usage:
+    python benchmarks/stub_server.py --port 8080 --fleet-size 200000 --latency-ms 20
+    python benchmarks/stub_server.py --upstream https://asXXX.awmdm.com/api --record tenant.jsonl
+    python benchmarks/stub_server.py --replay tenant.jsonl
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError
+
+
+class StubConfig:
+    """Fleet shape and fault injection settings for the stub server."""
+
+    def __init__(self, fleet_size=1000, user_count=500, user_group_count=50, app_count=50, og_count=100,
+                 og_fanout=5, latency_ms=0.0, latency_jitter_ms=0.0, throttle_rate=0.0, quota_rps=None,
+                 retry_after=1, error_rate=0.0, tail_rate=0.0, tail_latency_ms=0.0, seed=0):
+        self.fleet_size = fleet_size
+        self.user_count = user_count
+        self.user_group_count = user_group_count
+        self.app_count = app_count
+        self.og_count = og_count
+        self.og_fanout = og_fanout
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.throttle_rate = throttle_rate
+        self.quota_rps = quota_rps
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.tail_rate = tail_rate
+        self.tail_latency_ms = tail_latency_ms
+        self.seed = seed
+
+
+class Fleet:
+    """Deterministic synthetic tenant data, generated on demand so large fleets cost no memory."""
+
+    def __init__(self, config):
+        self.config = config
+
+    def device(self, device_id):
+        return {
+            "Id": {"Value": device_id},
+            "Udid": f"udid-{device_id:010d}",
+            "SerialNumber": f"SN{device_id:010d}",
+            "MacAddress": ":".join(f"{(device_id >> shift) & 0xFF:02X}" for shift in (40, 32, 24, 16, 8, 0)),
+            "Imei": f"35{device_id:013d}",
+            "AssetNumber": f"A{device_id}",
+            "DeviceFriendlyName": f"Device {device_id}",
+            "LocationGroupId": {"Id": {"Value": self.og_of_device(device_id)}, "Name": f"OG {self.og_of_device(device_id)}"},
+            "UserName": f"user{device_id % max(1, self.config.user_count)}",
+            "Platform": "Android",
+            "Model": "Pixel",
+            "OperatingSystem": "14.0",
+            "EnrollmentStatus": "Enrolled",
+            "BatteryLevel": device_id % 100,
+        }
+
+    def health_check_device(self, device_id):
+        return {
+            "DeviceId": {"Value": device_id},
+            "UDID": f"udid-{device_id:010d}",
+            "SerialNumber": f"SN{device_id:010d}",
+            "AssetNumber": f"A{device_id}",
+            "FriendlyName": f"Device {device_id}",
+            "OrganizationGroupId": self.og_of_device(device_id),
+            "Username": f"user{device_id % max(1, self.config.user_count)}",
+            "AvailableDiskSpace": 53687091200,
+            "TotalMemory": 8589934592,
+            "DeviceNetworkInfo": {"IP": f"10.{(device_id >> 16) & 255}.{(device_id >> 8) & 255}.{device_id & 255}"},
+        }
+
+    def user(self, user_id):
+        return {
+            "Id": {"Value": user_id},
+            "UserName": f"user{user_id}",
+            "FirstName": "User",
+            "LastName": str(user_id),
+            "Email": f"user{user_id}@example.com",
+            "Status": True,
+            "LocationGroupId": "1",
+        }
+
+    def user_group(self, group_id):
+        return {"UserGroupId": group_id, "UserGroupName": f"group{group_id}", "OrganizationGroupId": 1}
+
+    def app(self, app_id):
+        return {
+            "Id": {"Value": app_id},
+            "ApplicationName": f"App {app_id}",
+            "BundleId": f"com.example.app{app_id}",
+            "AppVersion": "1.0.0",
+            "Status": "Active",
+            "AssignedDeviceCount": app_id * 10,
+            "Platform": 5,
+        }
+
+    def organization_group(self, og_id):
+        parent = None if og_id == 1 else (og_id - 2) // self.config.og_fanout + 1
+        return {
+            "Id": {"Value": og_id},
+            "Name": "Global" if og_id == 1 else f"OG {og_id}",
+            "GroupId": f"OG{og_id}",
+            "LocationGroupType": "Container",
+            "Uuid": f"00000000-0000-0000-0000-{og_id:012d}",
+            "ParentLocationGroup": {"Id": {"Value": parent}} if parent else None,
+        }
+
+    def og_children(self, og_id):
+        first = (og_id - 1) * self.config.og_fanout + 2
+        return [child for child in range(first, first + self.config.og_fanout) if child <= self.config.og_count]
+
+    def og_of_device(self, device_id):
+        return device_id % self.config.og_count + 1
+
+
+def _paged(params, total, make, records_key, default_page_size=500):
+    """Build one AirWatch-style page (0-based) over ids 1..total."""
+    page = int(params.get("page", 0))
+    page_size = int(params.get("pagesize", default_page_size))
+    start = page * page_size + 1
+    stop = min(total, start + page_size - 1)
+    return {records_key: [make(i) for i in range(start, stop + 1)], "Page": page, "PageSize": page_size, "Total": total}
+
+
+class StubRoutes:
+    """Maps (method, path) to synthetic responses for the endpoints the controllers use."""
+
+    def __init__(self, fleet):
+        self.fleet = fleet
+        self._next_id = 1000000
+        self._lock = threading.Lock()
+        self.routes = [
+            ("GET", r"/mdm/products/devicehealthcheck", self.device_health_check),
+            ("GET", r"/mdm/devices/search", self.device_search),
+            ("GET", r"/mdm/devices/serialnumber/(?P<serial>[^/]+)", self.device_by_serial),
+            ("GET", r"/mdm/devices/extensivesearch", self.extensive_search),
+            ("POST", r"/mdm/devices/commands/bulk", self.bulk_command),
+            ("GET", r"/mdm/products/(?P<id>\d+)", self.product),
+            ("GET", r"/mam/apps/search", self.app_search),
+            ("GET", r"/mam/apps/internal/(?P<id>\d+)", self.internal_app),
+            ("POST", r"/mam/blobs/uploadblob", self.created),
+            ("POST", r"/mam/apps/internal/uploadchunk", self.upload_chunk),
+            ("POST", r"/mam/apps/internal/begininstall", self.created),
+            ("GET", r"/system/users/search", self.user_search),
+            ("GET", r"/system/users/(?P<id>\d+)", self.user),
+            ("POST", r"/system/users/adduser", self.created),
+            ("GET", r"/system/usergroups/custom/search", self.user_group_search),
+            ("POST", r"/system/usergroups/createcustomusergroup", self.created),
+            ("GET", r"/system/usergroups/(?P<id>\d+)/users", self.user_group_members),
+            ("GET", r"/system/groups/search", self.og_search),
+            ("GET", r"/system/groups/(?P<id>\d+)/children", self.og_children),
+            ("GET", r"/system/groups/(?P<id>\d+)", self.og),
+            ("POST", r"/mdm/smartgroups", self.created),
+            ("POST", r"/system/groups/(?P<id>\d+)", self.created),
+        ]
+        self.routes = [(method, re.compile(pattern + "$"), handler) for method, pattern, handler in self.routes]
+
+    def dispatch(self, method, path, params, body):
+        """Return (status, body) for a request; unmatched mutating calls succeed with an empty body."""
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if route_method == method and match:
+                return handler(params=params, body=body, **match.groupdict())
+        if method in ("POST", "PUT", "DELETE"):
+            return 200, {}
+        return 404, {"errorCode": 404, "message": f"No stub route for {method} {path}"}
+
+    def _new_id(self):
+        with self._lock:
+            self._next_id += 1
+            return self._next_id
+
+    def created(self, **_):
+        return 200, {"Value": self._new_id()}
+
+    def device_health_check(self, params, **_):
+        return 200, _paged(params, self.fleet.config.fleet_size, self.fleet.health_check_device, "Device")
+
+    def device_search(self, params, **_):
+        total = self.fleet.config.fleet_size
+        if "seensince" in params:
+            total = min(total, max(1, total // 100))
+        return 200, _paged(params, total, self.fleet.device, "Devices")
+
+    def device_by_serial(self, serial, **_):
+        digits = serial[2:] if serial.upper().startswith("SN") else serial
+        if not digits.isdigit() or not 1 <= int(digits) <= self.fleet.config.fleet_size:
+            return 404, {"errorCode": 404, "message": "Device not found"}
+        return 200, self.fleet.device(int(digits))
+
+    def extensive_search(self, params, **_):
+        device_id = int(params.get("deviceid", 1))
+        return 200, {"Devices": [self.fleet.device(device_id)], "Total": 1}
+
+    def bulk_command(self, body, **_):
+        values = ((body or {}).get("BulkValues") or {}).get("Value", [])
+        return 200, {"TotalItems": len(values), "AcceptedItems": len(values), "FailedItems": 0, "Faults": {"Fault": []}}
+
+    def product(self, id, **_):
+        return 200, {"Id": {"Value": int(id)}, "Name": f"Product {id}", "Active": True, "Platform": 5}
+
+    def app_search(self, params, **_):
+        bundle_id = params.get("bundleid", "")
+        if bundle_id:
+            matches = [app_id for app_id in range(1, self.fleet.config.app_count + 1)
+                       if self.fleet.app(app_id)["BundleId"] == bundle_id]
+            return 200, {"Application": [self.fleet.app(app_id) for app_id in matches], "Total": len(matches)}
+        return 200, _paged(params, self.fleet.config.app_count, self.fleet.app, "Application")
+
+    def internal_app(self, id, **_):
+        return 200, {**self.fleet.app(int(id)), "SmartGroups": [], "Assignments": []}
+
+    def upload_chunk(self, body, **_):
+        transaction_id = (body or {}).get("TransactionId") or f"txn-{self._new_id()}"
+        return 200, {"TranscationId": transaction_id, "UploadSuccess": True}
+
+    def user_search(self, params, **_):
+        username = params.get("username", "")
+        if username:
+            user_id = int(username[4:]) if username.startswith("user") and username[4:].isdigit() else 0
+            users = [self.fleet.user(user_id)] if 1 <= user_id <= self.fleet.config.user_count else []
+            return 200, {"Users": users, "Total": len(users), "Page": 0, "PageSize": 500}
+        return 200, _paged(params, self.fleet.config.user_count, self.fleet.user, "Users")
+
+    def user(self, id, **_):
+        return 200, self.fleet.user(int(id))
+
+    def user_group_search(self, params, **_):
+        name = params.get("groupname", "")
+        groups = [self.fleet.user_group(group_id) for group_id in range(1, self.fleet.config.user_group_count + 1)]
+        if name:
+            groups = [group for group in groups if group["UserGroupName"] == name]
+        return 200, {"UserGroup": groups, "Total": len(groups)}
+
+    def user_group_members(self, id, params, **_):
+        return 200, _paged(params, self.fleet.config.user_count, self.fleet.user, "EnrollmentUser")
+
+    def og_search(self, params, **_):
+        group_id = params.get("groupid", "")
+        matches = [og_id for og_id in range(1, self.fleet.config.og_count + 1) if f"OG{og_id}" == group_id]
+        return 200, {"LocationGroups": [self.fleet.organization_group(og_id) for og_id in matches],
+                     "Total": len(matches)}
+
+    def og_children(self, id, **_):
+        return 200, [self.fleet.organization_group(child) for child in self.fleet.og_children(int(id))]
+
+    def og(self, id, **_):
+        if not 1 <= int(id) <= self.fleet.config.og_count:
+            return 404, {"errorCode": 404, "message": "Organization group not found"}
+        return 200, self.fleet.organization_group(int(id))
+
+
+class Recorder:
+    """Proxies requests to a real tenant and appends each exchange to a JSONL file."""
+
+    def __init__(self, upstream, record_path):
+        self.upstream = upstream.rstrip("/")
+        self.record_file = open(record_path, "a")
+        self._lock = threading.Lock()
+
+    def forward(self, method, raw_path, headers, body):
+        forwarded = {key: value for key, value in headers.items() if key.lower() not in ("host", "content-length")}
+        request = Request(f"{self.upstream}{raw_path}", data=body or None, headers=forwarded, method=method)
+        try:
+            with urlopen(request) as response:
+                status, content = response.status, response.read()
+        except HTTPError as error:
+            status, content = error.code, error.read()
+        with self._lock:
+            self.record_file.write(json.dumps({
+                "method": method, "path": raw_path, "status": status, "body": content.decode("utf-8", "replace"),
+            }) + "\n")
+            self.record_file.flush()
+        return status, content
+
+
+class Replayer:
+    """Serves responses from a recording, cycling through repeats of the same request."""
+
+    def __init__(self, replay_path):
+        self._responses = {}
+        self._positions = {}
+        self._lock = threading.Lock()
+        with open(replay_path) as replay_file:
+            for line in replay_file:
+                entry = json.loads(line)
+                self._responses.setdefault((entry["method"], entry["path"]), []).append(
+                    (entry["status"], entry["body"].encode())
+                )
+
+    def lookup(self, method, raw_path):
+        key = (method, raw_path)
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                return None
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            return responses[position % len(responses)]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Request handler; the routing, fault injection and recording live on the server."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _respond(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        server.count_request()
+
+        config = server.config
+        latency_ms = config.latency_ms + random.uniform(0, config.latency_jitter_ms)
+        if config.tail_rate and random.random() < config.tail_rate:
+            latency_ms += config.tail_latency_ms
+        if latency_ms:
+            time.sleep(latency_ms / 1000.0)
+        if server.over_quota() or (config.throttle_rate and random.random() < config.throttle_rate):
+            server.count("throttled")
+            return self._send(429, b'{"message": "Too many requests"}', {"Retry-After": str(config.retry_after)})
+        if config.error_rate and random.random() < config.error_rate:
+            server.count("errors")
+            return self._send(503, b'{"errorCode": 503, "message": "Injected error"}')
+
+        if server.replayer is not None:
+            recorded = server.replayer.lookup(self.command, self.path)
+            if recorded is None:
+                return self._send(404, json.dumps({"errorCode": 404, "message": "Not in recording"}).encode())
+            return self._send(*recorded)
+        if server.recorder is not None:
+            return self._send(*server.recorder.forward(self.command, self.path, self.headers, raw_body))
+
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        body = json.loads(raw_body) if raw_body and self.headers.get("Content-Type", "").startswith("application/json") else None
+        status, payload = server.routes.dispatch(self.command, url.path.rstrip("/"), params, body)
+        self._send(status, json.dumps(payload).encode())
+
+    def _send(self, status, content, extra_headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for key, value in (extra_headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address, config, recorder=None, replayer=None):
+        super().__init__(address, StubHandler)
+        self.config = config
+        self.routes = StubRoutes(Fleet(config))
+        self.recorder = recorder
+        self.replayer = replayer
+        self.url = f"http://{address[0]}:{self.server_address[1]}"
+        self.stats = {"requests": 0, "throttled": 0, "errors": 0}
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+
+    def handle_error(self, request, client_address):
+        # Clients that time out and hang up are expected; anything else is still reported.
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def count_request(self):
+        with self._lock:
+            self.stats["requests"] += 1
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+
+    def over_quota(self):
+        """True when more than quota_rps requests arrived in the current one-second window."""
+        if not self.config.quota_rps:
+            return False
+        with self._lock:
+            return self._window_count > self.config.quota_rps
+
+
+def start_stub_server(host="127.0.0.1", port=0, record_path=None, upstream=None, replay_path=None, **config):
+    """Start the stub server on a daemon thread and return it; its base URL is server.url.
+
+    Keyword arguments are StubConfig settings, e.g. ``fleet_size=100000,
+    latency_ms=20, throttle_rate=0.01``.
+    """
+    recorder = Recorder(upstream, record_path) if upstream and record_path else None
+    replayer = Replayer(replay_path) if replay_path else None
+    server = StubServer((host, port), StubConfig(**config), recorder, replayer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--fleet-size", type=int, default=1000)
+    parser.add_argument("--user-count", type=int, default=500)
+    parser.add_argument("--og-count", type=int, default=100)
+    parser.add_argument("--app-count", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--tail-rate", type=float, default=0.0, help="fraction of requests delayed by --tail-latency-ms")
+    parser.add_argument("--tail-latency-ms", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--quota-rps", type=int, default=None, help="answer 429 above this many requests/second")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--upstream", help="real tenant API URL to proxy to (record mode)")
+    parser.add_argument("--record", help="JSONL file to append proxied responses to")
+    parser.add_argument("--replay", help="JSONL recording to serve responses from")
+    args = parser.parse_args()
+
+    server = start_stub_server(
+        args.host, args.port, record_path=args.record, upstream=args.upstream, replay_path=args.replay,
+        fleet_size=args.fleet_size, user_count=args.user_count, og_count=args.og_count, app_count=args.app_count,
+        latency_ms=args.latency_ms, latency_jitter_ms=args.latency_jitter_ms, throttle_rate=args.throttle_rate,
+        quota_rps=args.quota_rps, retry_after=args.retry_after, error_rate=args.error_rate,
+        tail_rate=args.tail_rate, tail_latency_ms=args.tail_latency_ms,
+    )
+    print(f"AirWatch stub listening on {server.url}")
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+from async_rest_client import AsyncRestClient
+from chunked_uploader import DEFAULT_CHUNK_SIZE, ChunkedUploader
+from mam_rest_controller import MAMRestController
+from paginator import aiter_records
+
+
+class AsyncMAMRestController(MAMRestController):
+    """Asyncio counterpart of MAMRestController.
+
+    Every endpoint method has the same name and arguments as the blocking
+    controller but returns an awaitable, e.g.
+    ``await controller.details_of_internal_app_by_app_id(app_id)``.
+    The iter_* methods return async iterators (``async for device in ...``).
+    """
+
+    _paginate = staticmethod(aiter_records)
+
+    def __init__(self, apiurl, tenant, authorization, client=None):
+        super().__init__(apiurl, tenant, authorization, client or AsyncRestClient(apiurl, tenant, authorization))
+
+    async def upload_blob(self, filename, apk_file_path, module_type, organization_group_id):
+        """Upload an application blob."""
+        endpoint = f"/mam/blobs/uploadblob?filename={filename}&organizationgroupid={organization_group_id}&moduleType={module_type}"
+        with open(apk_file_path, "rb") as apk_file:
+            # Awaited inside the with block so the file is still open while it is sent.
+            return await self._make_request("POST", endpoint, files={"file": apk_file})
+
+    async def upload_blob_chunked(self, apk_file_path, chunk_size=DEFAULT_CHUNK_SIZE, max_workers=4, state_path=None,
+                                  progress_callback=None):
+        """Upload an application in resumable, parallel chunks and return its transaction ID."""
+        uploader = ChunkedUploader(self, chunk_size, max_workers, state_path, progress_callback)
+        return await uploader.upload_async(apk_file_path)
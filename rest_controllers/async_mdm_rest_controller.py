@@ -0,0 +1,40 @@
+from async_rest_client import AsyncRestClient
+from mdm_rest_controller import MDMRestController
+from paginator import afetch_pages_concurrently, aiter_records
+
+
+class AsyncMDMRestController(MDMRestController):
+    """Asyncio counterpart of MDMRestController.
+
+    Every endpoint method has the same name and arguments as the blocking
+    controller but returns an awaitable, e.g.
+    ``await controller.get_device_health_check(og_id, 500, 0)``.
+    The iter_* and fetch_*_pages methods return async iterators
+    (``async for device in ...``).
+    """
+
+    _paginate = staticmethod(aiter_records)
+    _fan_out_pages = staticmethod(afetch_pages_concurrently)
+
+    def __init__(self, apiurl, tenant, authorization, client=None, device_index=None):
+        super().__init__(
+            apiurl, tenant, authorization, client or AsyncRestClient(apiurl, tenant, authorization), device_index
+        )
+
+    async def get_device_id_by_serial_number(self, serial_number):
+        """Resolve a serial number to a device ID, via the device index when one is set."""
+        if self.device_index is not None:
+            device_id = self.device_index.resolve(serial_number=serial_number)
+            if device_id is not None:
+                return device_id
+        device = await self.retrieve_device_information(serial_number)
+        if self.device_index is not None:
+            self.device_index.add_records([device])
+        return str(device["Id"]["Value"])
+
+    async def delete_device_details_by_device_id(self, device_id):
+        """Delete device record by device ID."""
+        response = await self._make_request("DELETE", f"/mdm/devices/{device_id}")
+        if self.device_index is not None:
+            self.device_index.remove(device_id)
+        return response
@@ -0,0 +1,268 @@
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager, nullcontext
+
+import aiohttp
+
+from json_codec import get_decoder
+from rate_limiter import parse_retry_after
+from response_cache import ResponseCache
+from timeouts import DeadlineExceededError, Timeouts, current_deadline
+
+_sessions = {}
+
+
+def get_async_session(apiurl, tenant, max_concurrency=100, limit_per_host=0, pool_key=None):
+    """Return the shared aiohttp session for a tenant on the running event loop.
+
+    The session's connector caps the number of connections open at once, so
+    every async controller for the tenant shares one bounded keep-alive pool;
+    a ``pool_key`` gives its holders a separate pool, as in get_session.
+    Must be called from inside a coroutine.
+    """
+    loop = asyncio.get_running_loop()
+    key = (apiurl, tenant, loop, pool_key)
+    session = _sessions.get(key)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=max_concurrency, limit_per_host=limit_per_host)
+        session = aiohttp.ClientSession(connector=connector, headers={"aw-tenant-code": tenant})
+        _sessions[key] = session
+    return session
+
+
+async def close_async_sessions():
+    """Close every session created on the running event loop."""
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _sessions if key[2] is loop]:
+        await _sessions.pop(key).close()
+
+
+def discard_async_sessions(pool_key):
+    """Drop every session created for ``pool_key`` and close each one on its own event loop.
+
+    Safe to call from any thread; a session whose loop is already closed is only dropped.
+    """
+    for key in [key for key in _sessions if key[3] is pool_key]:
+        session = _sessions.pop(key)
+        loop = key[2]
+        if not session.closed and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+
+
+class AsyncRestClient:
+    """Asyncio counterpart of RestClient, backed by a pooled aiohttp session.
+
+    A token provider passed as ``authorization`` is awaited for the header
+    on every call, and a 401 is replayed once, as in RestClient.
+    """
+
+    def __init__(self, apiurl, tenant, authorization, max_concurrency=100, cache=None, single_flight=None,
+                 rate_limiter=None, max_throttle_retries=3, circuit_breakers=None, bulkhead=None, metrics=None,
+                 decoder=None, timeouts=None, hedging=None, pool_key=None):
+        self.apiurl = apiurl
+        self.tenant = tenant
+        self.authorization = authorization
+        self.max_concurrency = max_concurrency
+        self.pool_key = pool_key
+        self.token_provider = None if isinstance(authorization, str) else authorization
+        self.headers = {"Authorization": authorization} if self.token_provider is None else {}
+        self.cache = cache
+        self.single_flight = single_flight
+        self.rate_limiter = rate_limiter
+        self.max_throttle_retries = max_throttle_retries
+        self.circuit_breakers = circuit_breakers
+        self.bulkhead = bulkhead
+        self.metrics = metrics
+        self.decode = get_decoder(decoder)
+        self.timeouts = timeouts or Timeouts()
+        self.hedging = hedging
+
+    def _build_headers(self, headers):
+        """Merge per-call headers over the prebuilt client headers."""
+        if not headers:
+            return self.headers
+        return {**self.headers, **headers}
+
+    async def _auth_headers(self, headers):
+        """Like _build_headers, with the token provider's current header when one is set."""
+        headers = self._build_headers(headers)
+        if self.token_provider is not None:
+            headers = {**headers, "Authorization": await self.token_provider.authorization_async()}
+        return headers
+
+    def _client_timeout(self, endpoint):
+        """aiohttp timeouts for one call: the family's connect/read timeouts, bounded in total by the deadline."""
+        connect, read = self.timeouts.for_endpoint(endpoint)
+        deadline = current_deadline()
+        total = deadline.remaining() if deadline is not None else None
+        return aiohttp.ClientTimeout(total=total, sock_connect=connect, sock_read=read)
+
+    async def request(self, method, endpoint, payload=None, params=None, files=None, data=None, headers=None,
+                      raw=False):
+        """Send a request over the tenant's pooled session and return the decoded JSON body (bytes if raw).
+
+        ``files`` takes the same ``{field: file object}`` mapping as RestClient
+        and is sent as a multipart form. GETs go through the optional cache and
+        AsyncSingleFlight exactly as in RestClient.
+        """
+        if method != "GET":
+            body = await self._send(method, endpoint, payload, params, files, data, headers, raw)
+            if self.cache is not None:
+                self.cache.invalidate(endpoint)
+            return body
+        key = ResponseCache.make_key(endpoint, params)
+        if raw:
+            key += ("raw",)
+        if self.cache is not None:
+            hit, body = self.cache.get(key)
+            if hit:
+                return body
+        if self.single_flight is not None:
+            body = await self.single_flight.do(
+                key, lambda: self._send(method, endpoint, payload, params, files, data, headers, raw)
+            )
+        else:
+            body = await self._send(method, endpoint, payload, params, files, data, headers, raw)
+        if self.cache is not None:
+            self.cache.set(key, body)
+        return body
+
+    async def _send(self, method, endpoint, payload, params, files, data, headers, raw=False, stream=False):
+        """Send one call through the bulkhead and circuit breaker and decode the response.
+
+        With ``stream=True`` the response is returned with its body unread; the caller must release it.
+        """
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.check()
+        # Checked before queueing for a bulkhead slot so an open circuit fails fast.
+        breaker = self.circuit_breakers.breaker(endpoint) if self.circuit_breakers is not None else None
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            async with self.bulkhead.limit_async(endpoint) if self.bulkhead is not None else nullcontext():
+                response, body = await self._attempt(
+                    method, endpoint, payload, params, files, data, headers, stream
+                )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if isinstance(e, asyncio.TimeoutError) and deadline is not None and deadline.expired():
+                # The timeout was cut short by the job's deadline, not by a slow upstream.
+                if breaker is not None:
+                    breaker.release()
+                raise DeadlineExceededError("Job deadline exceeded") from e
+            if breaker is not None:
+                breaker.on_failure()
+            raise
+        except BaseException:
+            # Deadline, token, bulkhead errors and cancellation say nothing about the upstream;
+            # give back a half-open trial slot so the circuit is not stuck half-open.
+            if breaker is not None:
+                breaker.release()
+            raise
+        if breaker is not None:
+            if response.status >= 500:
+                breaker.on_failure()
+            else:
+                breaker.on_success()
+        if stream and not response.ok:
+            response.release()
+        response.raise_for_status()
+        if self.rate_limiter is not None:
+            self.rate_limiter.on_success(endpoint)
+        if stream:
+            return response
+        if raw:
+            return body
+        # Like aiohttp's response.json(), an empty body decodes to None.
+        return self.decode(body) if body and not body.isspace() else None
+
+    async def _attempt(self, method, endpoint, payload, params, files, data, headers, stream=False):
+        """Run the exchange, hedged when the hedging policy covers the call."""
+        # A streamed body is read after this returns, so a losing hedge could not be cleaned up.
+        if self.hedging is not None and not stream and self.hedging.applies(method, endpoint):
+            return await self.hedging.run_async(
+                method, endpoint, lambda: self._exchange(method, endpoint, payload, params, files, data, headers)
+            )
+        return await self._exchange(method, endpoint, payload, params, files, data, headers, stream)
+
+    async def _exchange(self, method, endpoint, payload, params, files, data, headers, stream=False):
+        """Perform the HTTP round trip, replaying it once with a fresh token after a 401."""
+        response, body = await self._throttled_exchange(
+            method, endpoint, payload, params, files, data, headers, stream
+        )
+        if response.status == 401 and self.token_provider is not None:
+            self.token_provider.invalidate(response.request_info.headers.get("Authorization"))
+            response.release()
+            response, body = await self._throttled_exchange(
+                method, endpoint, payload, params, files, data, headers, stream
+            )
+        return response, body
+
+    async def _throttled_exchange(self, method, endpoint, payload, params, files, data, headers, stream=False):
+        """Send the request, retrying throttled (429) responses.
+
+        Returns the response together with its body, which is read before the
+        connection is released. With ``stream`` the body is left unread (None)
+        and the connection stays open until the caller releases the response.
+        """
+        session = get_async_session(self.apiurl, self.tenant, self.max_concurrency, pool_key=self.pool_key)
+        if params:
+            # aiohttp rejects None query values; requests silently drops them.
+            params = {key: value for key, value in params.items() if value is not None}
+        headers = await self._auth_headers(headers)
+        if payload is not None:
+            # Serialised here rather than by aiohttp so the request size is known for metrics.
+            data = json.dumps(payload).encode()
+            headers = {**headers, "Content-Type": "application/json"}
+        for attempt in range(self.max_throttle_retries + 1):
+            if files:
+                data = aiohttp.FormData()
+                for field, file in files.items():
+                    file.seek(0)
+                    data.add_field(field, file, filename=os.path.basename(getattr(file, "name", field)))
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(endpoint)
+            started = self.metrics.on_request_start(method, endpoint) if self.metrics is not None else None
+            body = None
+            try:
+                response = await session.request(
+                    method, f"{self.apiurl}{endpoint}", params=params, data=data, headers=headers,
+                    timeout=self._client_timeout(endpoint),
+                )
+                if not stream:
+                    async with response:
+                        body = await response.read()
+            except Exception:
+                if self.metrics is not None:
+                    self.metrics.on_request_end(method, endpoint, started, "error")
+                raise
+            if self.metrics is not None:
+                bytes_out = len(data) if isinstance(data, bytes) else 0
+                bytes_in = len(body) if body is not None else 0
+                self.metrics.on_request_end(method, endpoint, started, response.status, bytes_in, bytes_out)
+            if response.status != 429 or attempt == self.max_throttle_retries:
+                return response, body
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            delay = retry_after if retry_after is not None else 2 ** attempt
+            deadline = current_deadline()
+            if deadline is not None and delay >= deadline.remaining():
+                return response, body  # Waiting out the throttle would overrun the job's deadline.
+            response.release()
+            if self.metrics is not None:
+                self.metrics.on_retry(method, endpoint)
+            if self.rate_limiter is not None:
+                self.rate_limiter.on_throttle(endpoint, retry_after)
+            else:
+                await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def stream(self, method, endpoint, params=None, headers=None):
+        """Send a request and yield the response's StreamReader for incremental parsing.
+
+        The call goes through the same deadline check, bulkhead, circuit
+        breaker, rate limiter, 429 retries and 401 replay as request().
+        """
+        response = await self._send(method, endpoint, None, params, None, None, headers, stream=True)
+        async with response:
+            yield response.content
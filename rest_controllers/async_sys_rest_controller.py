@@ -0,0 +1,74 @@
+from async_rest_client import AsyncRestClient
+from directory_keys import USER, USER_GROUP, user_group_id
+from json_stream import aiter_json_items
+from sys_rest_controller import SYSRestController
+from paginator import aiter_records
+
+
+class AsyncSYSRestController(SYSRestController):
+    """Asyncio counterpart of SYSRestController.
+
+    Every endpoint method has the same name and arguments as the blocking
+    controller but returns an awaitable, e.g.
+    ``await controller.search_for_organization_group(og_name)``.
+    The iter_* methods return async iterators (``async for device in ...``).
+    """
+
+    _paginate = staticmethod(aiter_records)
+
+    def __init__(self, apiurl, tenant, authorization, client=None, directory_index=None):
+        super().__init__(
+            apiurl, tenant, authorization, client or AsyncRestClient(apiurl, tenant, authorization), directory_index
+        )
+
+    async def _invalidate_directory_entry(self, response, kind, name):
+        """Drop a name from the directory index once the awaited create call has succeeded."""
+        response = await response
+        if self.directory_index is not None:
+            self.directory_index.invalidate(kind, name)
+        return response
+
+    async def resolve_user_id(self, username):
+        """Resolve a username to a user ID (None if it does not exist), via the directory index when set."""
+        if self.directory_index is not None:
+            found, user_id = self.directory_index.get(USER, username)
+            if found:
+                return user_id
+        user_id = None
+        async for user in self.iter_enrollment_users(username):
+            if user.get("UserName", "").lower() == username.lower():
+                user_id = user["Id"]["Value"]
+                break
+        return self._record_resolution(USER, username, user_id)
+
+    async def resolve_user_group_id(self, group_name):
+        """Resolve a custom user group name to its ID (None if it does not exist), via the directory index when set."""
+        if self.directory_index is not None:
+            found, group_id = self.directory_index.get(USER_GROUP, group_name)
+            if found:
+                return group_id
+        group_id = None
+        async for group in self.iter_custom_user_groups(group_name):
+            if group.get("UserGroupName", "").lower() == group_name.lower():
+                group_id = user_group_id(group)
+                break
+        return self._record_resolution(USER_GROUP, group_name, group_id)
+
+    async def stream_users_from_custom_user_group_id(self, user_group_id, page_size=500):
+        """Yield the users of a custom user group one at a time, parsing each page incrementally."""
+        endpoint = f"/system/usergroups/{user_group_id}/users"
+        page = 0
+        largest_page = 0
+        while True:
+            count = 0
+            params = {"pagesize": page_size, "page": page}
+            async with self.client.stream("GET", endpoint, params=params, headers=self.extra_headers) as body:
+                async for user in aiter_json_items(body, "EnrollmentUser"):
+                    count += 1
+                    yield user
+            # The server may cap pagesize below page_size, so only an empty page, or one shorter
+            # than an earlier page, marks the end.
+            if count == 0 or count < largest_page:
+                return
+            largest_page = count
+            page += 1
@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+from endpoints import endpoint_family
+
+
+class BulkheadFullError(Exception):
+    """Raised when an endpoint family has no free slot within the bulkhead's max_wait."""
+
+
+class Bulkhead:
+    """Separate concurrency limits per endpoint family.
+
+    Each family (/mdm, /mam, /system) gets its own pool of ``max_concurrent``
+    slots, or the value in ``family_limits``. A slow family therefore cannot
+    tie up every worker: callers wait at most ``max_wait`` seconds for a slot
+    and then get BulkheadFullError. The slots are shared by threads and
+    asyncio tasks.
+    """
+
+    def __init__(self, max_concurrent=10, family_limits=None, max_wait=5.0):
+        self.max_concurrent = max_concurrent
+        self.family_limits = family_limits or {}
+        self.max_wait = max_wait
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, family):
+        with self._lock:
+            semaphore = self._semaphores.get(family)
+            if semaphore is None:
+                limit = self.family_limits.get(family, self.max_concurrent)
+                semaphore = self._semaphores[family] = threading.BoundedSemaphore(limit)
+            return semaphore
+
+    @contextmanager
+    def limit(self, endpoint):
+        """Hold one of the endpoint family's slots for the duration of the block."""
+        family = endpoint_family(endpoint)
+        semaphore = self._semaphore(family)
+        if not semaphore.acquire(timeout=self.max_wait):
+            raise BulkheadFullError(f"No free {family} slot within {self.max_wait}s")
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    @asynccontextmanager
+    async def limit_async(self, endpoint):
+        """Async counterpart of limit; polls for a slot without blocking the event loop."""
+        family = endpoint_family(endpoint)
+        semaphore = self._semaphore(family)
+        deadline = time.monotonic() + self.max_wait
+        while not semaphore.acquire(blocking=False):
+            if time.monotonic() >= deadline:
+                raise BulkheadFullError(f"No free {family} slot within {self.max_wait}s")
+            await asyncio.sleep(0.01)
+        try:
+            yield
+        finally:
+            semaphore.release()
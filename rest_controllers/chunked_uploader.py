@@ -0,0 +1,141 @@
+import asyncio
+import base64
+import contextvars
+import json
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+DEFAULT_CHUNK_SIZE = 5 * 1024 * 1024
+
+
+class ChunkedUploader:
+    """Chunked, resumable, parallel upload of an application file.
+
+    The file is memory-mapped and sent chunk by chunk to
+    ``/mam/apps/internal/uploadchunk``, so memory use depends on
+    ``chunk_size * max_workers`` rather than the file size. The first chunk
+    is sent alone to obtain the transaction ID; the rest go out in parallel.
+    When ``state_path`` is given, every acknowledged chunk is recorded there
+    and a later upload of the same, unchanged file resumes from it.
+    ``progress_callback(bytes_sent, total_bytes, bytes_per_sec)`` is called
+    after each acknowledged chunk.
+    """
+
+    def __init__(self, mam_controller, chunk_size=DEFAULT_CHUNK_SIZE, max_workers=4, state_path=None,
+                 progress_callback=None):
+        self.mam_controller = mam_controller
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.state_path = state_path
+        self.progress_callback = progress_callback
+        self._lock = threading.Lock()
+
+    def _load_state(self, apk_file_path, total_size):
+        """Return saved progress for this file, or a fresh state if it changed or none exists."""
+        fingerprint = {
+            "file": os.path.abspath(apk_file_path),
+            "size": total_size,
+            "mtime": os.path.getmtime(apk_file_path),
+            "chunk_size": self.chunk_size,
+        }
+        if self.state_path and os.path.exists(self.state_path):
+            with open(self.state_path) as state_file:
+                state = json.load(state_file)
+            if all(state.get(key) == value for key, value in fingerprint.items()):
+                return state
+        return {**fingerprint, "transaction_id": "", "acked": []}
+
+    def _save_state(self, state):
+        if not self.state_path:
+            return
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as state_file:
+            json.dump(state, state_file)
+        os.replace(tmp_path, self.state_path)
+
+    def _chunk_payload(self, data, transaction_id, sequence_number, total_size):
+        start = (sequence_number - 1) * self.chunk_size
+        chunk = data[start:start + self.chunk_size]
+        return transaction_id, base64.b64encode(chunk).decode("ascii"), sequence_number, total_size, len(chunk)
+
+    def _open_data(self, apk_file, total_size):
+        # mmap refuses zero-length files; an empty file is sent as a single empty chunk.
+        if total_size == 0:
+            return nullcontext(b"")
+        return mmap.mmap(apk_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _ack(self, state, sequence_number, response, total_size, session):
+        """Record an acknowledged chunk, persist progress and report throughput.
+
+        ``session`` holds this run's start time and bytes sent, so the rate
+        reported after a resume does not count chunks sent by an earlier run.
+        """
+        if not response.get("UploadSuccess", True):
+            raise RuntimeError(f"Chunk {sequence_number} was rejected: {response}")
+        with self._lock:
+            # AirWatch spells the response field "TranscationId".
+            state["transaction_id"] = (
+                state["transaction_id"] or response.get("TranscationId") or response.get("TransactionId") or ""
+            )
+            state["acked"].append(sequence_number)
+            self._save_state(state)
+            bytes_sent = min(total_size, len(state["acked"]) * self.chunk_size)
+            session["bytes"] += min(self.chunk_size, total_size - (sequence_number - 1) * self.chunk_size)
+            session_bytes = session["bytes"]
+        if self.progress_callback:
+            elapsed = max(time.monotonic() - session["started"], 1e-9)
+            self.progress_callback(bytes_sent, total_size, session_bytes / elapsed)
+
+    def _pending(self, state, total_size):
+        chunk_count = max(1, -(-total_size // self.chunk_size))
+        acked = set(state["acked"])
+        return [number for number in range(1, chunk_count + 1) if number not in acked]
+
+    def upload(self, apk_file_path):
+        """Upload the file and return the transaction ID to install it from."""
+        total_size = os.path.getsize(apk_file_path)
+        state = self._load_state(apk_file_path, total_size)
+        session = {"started": time.monotonic(), "bytes": 0}
+        with open(apk_file_path, "rb") as apk_file, self._open_data(apk_file, total_size) as data:
+            pending = self._pending(state, total_size)
+            if pending and not state["transaction_id"]:
+                first = pending.pop(0)
+                response = self.mam_controller.upload_chunk(*self._chunk_payload(data, "", first, total_size))
+                self._ack(state, first, response, total_size, session)
+
+            def send(sequence_number):
+                payload = self._chunk_payload(data, state["transaction_id"], sequence_number, total_size)
+                self._ack(state, sequence_number, self.mam_controller.upload_chunk(*payload), total_size, session)
+
+            # Workers run in copies of the caller's context so they keep its Deadline.
+            context = contextvars.copy_context()
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for _ in executor.map(lambda number: context.copy().run(send, number), pending):
+                    pass
+        return state["transaction_id"]
+
+    async def upload_async(self, apk_file_path):
+        """Async counterpart of upload for the async MAM controller."""
+        total_size = os.path.getsize(apk_file_path)
+        state = self._load_state(apk_file_path, total_size)
+        session = {"started": time.monotonic(), "bytes": 0}
+        with open(apk_file_path, "rb") as apk_file, self._open_data(apk_file, total_size) as data:
+            pending = self._pending(state, total_size)
+            if pending and not state["transaction_id"]:
+                first = pending.pop(0)
+                response = await self.mam_controller.upload_chunk(*self._chunk_payload(data, "", first, total_size))
+                self._ack(state, first, response, total_size, session)
+            semaphore = asyncio.Semaphore(self.max_workers)
+
+            async def send(sequence_number):
+                async with semaphore:
+                    payload = self._chunk_payload(data, state["transaction_id"], sequence_number, total_size)
+                    response = await self.mam_controller.upload_chunk(*payload)
+                self._ack(state, sequence_number, response, total_size, session)
+
+            await asyncio.gather(*(send(sequence_number) for sequence_number in pending))
+        return state["transaction_id"]
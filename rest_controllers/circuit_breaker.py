@@ -0,0 +1,91 @@
+import threading
+import time
+
+from endpoints import endpoint_family
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while an endpoint family's circuit is open."""
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker for one endpoint family.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast with CircuitOpenError. Once ``reset_timeout`` seconds have
+    passed it goes half-open and lets ``half_open_max_calls`` trial calls
+    through: a success closes it again, a failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30, half_open_max_calls=1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_calls = 0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may be attempted now."""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    raise CircuitOpenError(f"Circuit for {self.name} is open")
+                self.state = self.HALF_OPEN
+                self._trial_calls = 0
+            if self.state == self.HALF_OPEN:
+                if self._trial_calls >= self.half_open_max_calls:
+                    raise CircuitOpenError(f"Circuit for {self.name} is half-open; trial call in progress")
+                self._trial_calls += 1
+
+    def on_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def release(self):
+        """Return a half-open trial slot taken by before_call for a call that ended with no upstream verdict."""
+        with self._lock:
+            if self.state == self.HALF_OPEN and self._trial_calls > 0:
+                self._trial_calls -= 1
+
+    def on_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class CircuitBreakerRegistry:
+    """Hands out one CircuitBreaker per endpoint family (/mdm, /mam, /system)."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=30, half_open_max_calls=1):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, endpoint):
+        """Return the breaker for an endpoint's family, creating it on first use."""
+        family = endpoint_family(endpoint)
+        with self._lock:
+            breaker = self._breakers.get(family)
+            if breaker is None:
+                breaker = self._breakers[family] = CircuitBreaker(
+                    family, self.failure_threshold, self.reset_timeout, self.half_open_max_calls
+                )
+            return breaker
+
+    def states(self):
+        """Current state per endpoint family."""
+        with self._lock:
+            return {family: breaker.state for family, breaker in self._breakers.items()}
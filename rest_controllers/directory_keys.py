@@ -0,0 +1,10 @@
+# Kinds of entries kept by automation_objects.directory_index.DirectoryIndex.
+USER = "user"
+USER_GROUP = "user_group"
+
+
+def user_group_id(group):
+    """Extract the ID from a custom user group search record."""
+    if "UserGroupId" in group:
+        return group["UserGroupId"]
+    return group["Id"]["Value"]
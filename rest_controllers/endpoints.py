@@ -0,0 +1,13 @@
+def endpoint_family(endpoint):
+    """Return the API family an endpoint belongs to: "/mdm", "/mam" or "/system"."""
+    path = endpoint.split("?", 1)[0]
+    return "/" + path.strip("/").split("/", 1)[0]
+
+
+def endpoint_template(endpoint):
+    """Collapse IDs in an endpoint path so calls group by route, e.g. /mdm/devices/{id}/commands."""
+    path = endpoint.split("?", 1)[0]
+    return "/".join(
+        "{id}" if any(char.isdigit() for char in segment) else segment
+        for segment in path.split("/")
+    )
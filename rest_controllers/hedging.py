@@ -0,0 +1,207 @@
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from endpoints import endpoint_template
+
+
+def _percentile(samples, quantile):
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+class HedgingPolicy:
+    """Opt-in hedged GETs for RestClient and AsyncRestClient.
+
+    If a GET has not answered within its endpoint's observed ``quantile``
+    latency (p95 by default, over the last ``window`` calls to the same
+    route), a duplicate is sent and whichever answers first is returned.
+    Endpoints hedge only after ``min_samples`` calls, and only if they match
+    one of the ``endpoints`` prefixes when that is given. Hedges are capped
+    at ``max_hedge_ratio`` of all calls so a slow tenant does not get double
+    the load. The slower attempt is left to finish and is only used to
+    measure what the latency would have been without hedging; see stats().
+    A hedgeable call's first attempt starts at once on its own thread, so it
+    never queues; only the hedges share the ``max_workers`` pool.
+    """
+
+    def __init__(self, quantile=0.95, min_delay=0.01, max_hedge_ratio=0.05, min_samples=20, window=200,
+                 endpoints=None, max_workers=32):
+        self.quantile = quantile
+        self.min_delay = min_delay
+        self.max_hedge_ratio = max_hedge_ratio
+        self.min_samples = min_samples
+        self.window = window
+        self.endpoints = tuple(endpoints) if endpoints else None
+        self.max_workers = max_workers
+        self._executor = None
+        self._samples = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.budget_denied = 0
+        self._unhedged_latencies = deque(maxlen=10000)
+        self._hedged_latencies = deque(maxlen=10000)
+
+    def applies(self, method, endpoint):
+        """True if calls to this endpoint may be hedged."""
+        return method == "GET" and (self.endpoints is None or endpoint.startswith(self.endpoints))
+
+    def hedge_delay(self, method, endpoint):
+        """Seconds to wait before hedging a call, or None while the endpoint has too few samples."""
+        with self._lock:
+            samples = self._samples.get((method, endpoint_template(endpoint)))
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            return max(self.min_delay, _percentile(samples, self.quantile))
+
+    def _record_attempt(self, key, latency, primary=True):
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(latency)
+            if primary:
+                self._unhedged_latencies.append(latency)
+
+    def _record_call(self, latency, hedged, hedge_won):
+        with self._lock:
+            self._hedged_latencies.append(latency)
+            self.hedged += hedged
+            self.hedge_wins += hedge_won
+
+    def _count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def _allow_hedge(self):
+        with self._lock:
+            if self.hedged < self.max_hedge_ratio * self.requests:
+                return True
+            self.budget_denied += 1
+            return False
+
+    def _start_primary(self, key, started, attempt):
+        # Not on the shared pool: a primary queued behind other calls' attempts would add to the very latency
+        # hedging is meant to cut. The caller's thread waits on the future so it can return a faster hedge.
+        future = Future()
+        future.set_running_or_notify_cancel()
+        context = contextvars.copy_context()
+
+        def run():
+            try:
+                future.set_result(context.run(attempt))
+            except BaseException as e:
+                future.set_exception(e)
+
+        future.add_done_callback(lambda _: self._record_attempt(key, time.perf_counter() - started))
+        threading.Thread(target=run, name="hedged-request-primary", daemon=True).start()
+        return future
+
+    def _submit_hedge(self, key, started, attempt):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix="hedged-request")
+        # A fresh context copy per attempt carries the caller's Deadline into the worker.
+        future = self._executor.submit(contextvars.copy_context().run, attempt)
+        future.add_done_callback(lambda _: self._record_attempt(key, time.perf_counter() - started, False))
+        return future
+
+    def run(self, method, endpoint, attempt):
+        """Call ``attempt()`` (one full HTTP exchange), hedging it once if it is slow."""
+        key = (method, endpoint_template(endpoint))
+        delay = self.hedge_delay(method, endpoint)
+        self._count_request()
+        started = time.perf_counter()
+        if delay is None:
+            try:
+                return attempt()
+            finally:
+                self._record_attempt(key, time.perf_counter() - started)
+                self._record_call(time.perf_counter() - started, False, False)
+        primary = self._start_primary(key, started, attempt)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._allow_hedge():
+            try:
+                return primary.result()
+            finally:
+                self._record_call(time.perf_counter() - started, False, False)
+        hedge = self._submit_hedge(key, time.perf_counter(), attempt)
+        pending = {primary, hedge}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in done if future.exception() is None), None)
+            if winner is not None or not pending:
+                break
+        self._record_call(time.perf_counter() - started, True, winner is hedge)
+        return (winner or primary).result()
+
+    async def run_async(self, method, endpoint, attempt):
+        """Async counterpart of run(); ``attempt`` is a coroutine function."""
+        key = (method, endpoint_template(endpoint))
+        delay = self.hedge_delay(method, endpoint)
+        self._count_request()
+        started = time.perf_counter()
+        if delay is None:
+            try:
+                return await attempt()
+            finally:
+                self._record_attempt(key, time.perf_counter() - started)
+                self._record_call(time.perf_counter() - started, False, False)
+        primary = self._create_task(key, started, attempt)
+        done, _ = await asyncio.wait([primary], timeout=delay)
+        if done or not self._allow_hedge():
+            try:
+                return await primary
+            finally:
+                self._record_call(time.perf_counter() - started, False, False)
+        hedge = self._create_task(key, time.perf_counter(), attempt, primary=False)
+        pending = {primary, hedge}
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winner = next((task for task in done if task.exception() is None), None)
+            if winner is not None or not pending:
+                break
+        self._record_call(time.perf_counter() - started, True, winner is hedge)
+        return (winner or primary).result()
+
+    def _create_task(self, key, started, attempt, primary=True):
+        task = asyncio.ensure_future(attempt())
+
+        def on_done(task):
+            if not task.cancelled():
+                task.exception()  # Mark the loser's error as retrieved.
+            self._record_attempt(key, time.perf_counter() - started, primary)
+
+        task.add_done_callback(on_done)
+        return task
+
+    def stats(self):
+        """Hedge counters plus p99 latency as seen by callers against p99 of the first attempt alone."""
+        with self._lock:
+            p99_unhedged = _percentile(self._unhedged_latencies, 0.99)
+            p99_hedged = _percentile(self._hedged_latencies, 0.99)
+            return {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_rate": self.hedged / self.requests if self.requests else 0.0,
+                "hedge_wins": self.hedge_wins,
+                "budget_denied": self.budget_denied,
+                "p99_unhedged": p99_unhedged,
+                "p99_hedged": p99_hedged,
+                "p99_improvement": 1 - p99_hedged / p99_unhedged if p99_unhedged and p99_hedged else None,
+            }
+
+    def close(self):
+        """Shut down the worker threads used for sync hedges."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,48 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib decoder is used without it.
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # msgspec is optional as well.
+    msgspec = None
+
+
+def _stdlib_loads(data):
+    # json.loads takes str, bytes and bytearray but not memoryview.
+    return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+
+def _available_decoders():
+    decoders = {}
+    if orjson is not None:
+        decoders["orjson"] = orjson.loads
+    if msgspec is not None:
+        decoders["msgspec"] = msgspec.json.Decoder().decode
+    decoders["json"] = _stdlib_loads
+    return decoders
+
+
+DECODERS = _available_decoders()
+
+
+def get_decoder(name=None):
+    """Return a JSON decode function taking str, bytes, bytearray or memoryview.
+
+    With no name the fastest installed decoder is used (orjson, then msgspec,
+    then the stdlib). Any callable is returned as is, so clients can be
+    given a custom decoder.
+    """
+    if callable(name):
+        return name
+    if name is None:
+        return next(iter(DECODERS.values()))
+    if name not in DECODERS:
+        raise ValueError(f"JSON decoder {name!r} is not available; installed: {', '.join(DECODERS)}")
+    return DECODERS[name]
+
+
+loads = get_decoder()
@@ -0,0 +1,28 @@
+from json_codec import loads
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; without it each page is decoded in one go.
+    ijson = None
+
+
+def iter_json_items(body, array_key):
+    """Yield the elements of ``body[array_key]`` from a file-like JSON body.
+
+    With ijson installed the body is parsed incrementally, so only one element
+    is materialised at a time regardless of how large the array is.
+    """
+    if ijson is not None:
+        yield from ijson.items(body, f"{array_key}.item")
+        return
+    yield from (loads(body.read() or b"null") or {}).get(array_key) or []
+
+
+async def aiter_json_items(body, array_key):
+    """Async counterpart of iter_json_items for an aiohttp StreamReader."""
+    if ijson is not None:
+        async for item in ijson.items_async(body, f"{array_key}.item"):
+            yield item
+        return
+    for item in (loads(await body.read() or b"null") or {}).get(array_key) or []:
+        yield item
@@ -1,23 +1,21 @@
-import requests
+from chunked_uploader import DEFAULT_CHUNK_SIZE, ChunkedUploader
+from paginator import iter_records
+from rest_client import RestClient
 
 
 class MAMRestController:
-    def __init__(self, apiurl, tenant, authorization):
+    # Drives the iter_* methods; async subclasses swap in aiter_records.
+    _paginate = staticmethod(iter_records)
+
+    def __init__(self, apiurl, tenant, authorization, client=None):
         self.apiurl = apiurl
         self.tenant = tenant
         self.authorization = authorization
+        self.client = client or RestClient(apiurl, tenant, authorization)
 
-    def _make_request(self, method, endpoint, payload=None, params=None, files=None):
-        """Helper function to make HTTP requests."""
-        url = f"{self.apiurl}{endpoint}"
-        headers = {
-            "Authorization": self.authorization,
-            "aw-tenant-code": self.tenant,
-            "Content-Type": "application/json",
-        }
-        response = requests.request(method, url, json=payload, params=params, headers=headers, files=files)
-        response.raise_for_status()  # Raise an HTTPError for bad responses (4xx and 5xx)
-        return response.json()
+    def _make_request(self, method, endpoint, payload=None, params=None, files=None, raw=False):
+        """Helper function to make HTTP requests; raw=True returns the undecoded body bytes."""
+        return self.client.request(method, endpoint, payload=payload, params=params, files=files, raw=raw)
 
     def upload_blob(self, filename, apk_file_path, module_type, organization_group_id):
         """Upload an application blob."""
@@ -25,6 +23,28 @@ class MAMRestController:
         with open(apk_file_path, "rb") as apk_file:
             return self._make_request("POST", endpoint, files={"file": apk_file})
 
+    def upload_chunk(self, transaction_id, chunk_data, chunk_sequence_number, total_application_size, chunk_size):
+        """Upload one base64-encoded chunk of an application file."""
+        endpoint = "/mam/apps/internal/uploadchunk"
+        payload = {
+            "TransactionId": transaction_id,
+            "ChunkData": chunk_data,
+            "ChunkSequenceNumber": chunk_sequence_number,
+            "TotalApplicationSize": total_application_size,
+            "ChunkSize": chunk_size,
+        }
+        return self._make_request("POST", endpoint, payload=payload)
+
+    def upload_blob_chunked(self, apk_file_path, chunk_size=DEFAULT_CHUNK_SIZE, max_workers=4, state_path=None,
+                            progress_callback=None):
+        """Upload an application in resumable, parallel chunks and return its transaction ID.
+
+        See ChunkedUploader for the resume and progress semantics; install the
+        result with install_chunked_upload.
+        """
+        uploader = ChunkedUploader(self, chunk_size, max_workers, state_path, progress_callback)
+        return uploader.upload(apk_file_path)
+
     def rename_blob_application(self, application_name, application_value):
         """Rename a blob application."""
         endpoint = f"/mam/apps/internal/{application_value}"
@@ -49,6 +69,21 @@ class MAMRestController:
         }
         return self._make_request("POST", endpoint, payload=payload)
 
+    def install_chunked_upload(self, transaction_id, appname, deploy, auto_update_version, location_group_id):
+        """Install an application uploaded with upload_blob_chunked."""
+        endpoint = "/mam/apps/internal/begininstall"
+        payload = {
+            "DeviceType": 5,
+            "TransactionId": transaction_id,
+            "ApplicationName": appname,
+            "EnableProvisioning": False,
+            "SupportedModels": {"Model": [{"ModelId": 5, "ModelName": "Android"}]},
+            "PushMode": deploy,
+            "AutoUpdateVersion": auto_update_version,
+            "LocationGroupID": location_group_id,
+        }
+        return self._make_request("POST", endpoint, payload=payload)
+
     def install_blob_product(self, blob_value, appname, deploy, auto_update_version, location_group_id):
         """Install a blob product."""
         endpoint = "/mam/apps/internal/begininstall"
@@ -128,10 +163,17 @@ class MAMRestController:
         }
         return self._make_request("PUT", endpoint, payload=payload)
 
-    def search_application_by_bundle_id(self, bundle_id):
+    def search_application_by_bundle_id(self, bundle_id, page_size=None, page=None, raw=False):
         """Search for an application by bundle ID."""
         endpoint = f"/mam/apps/search?bundleid={bundle_id}"
-        return self._make_request("GET", endpoint)
+        params = {"pagesize": page_size, "page": page}
+        return self._make_request("GET", endpoint, params=params, raw=raw)
+
+    def iter_applications(self, bundle_id="", page_size=500):
+        """Stream every application matching bundle_id, fetching pages lazily."""
+        return self._paginate(
+            lambda page: self.search_application_by_bundle_id(bundle_id, page_size, page), "Application", page_size
+        )
 
     def delete_application_by_app_id(self, app_id):
         """Delete an application by app ID."""
@@ -1,23 +1,23 @@
-import requests
+from paginator import fetch_pages_concurrently, iter_records
+from rest_client import RestClient
 
 
 class MDMRestController:
-    def __init__(self, apiurl, tenant, authorization):
+    # Drive the iter_*/fetch_*_pages methods; async subclasses swap in the async versions.
+    _paginate = staticmethod(iter_records)
+    _fan_out_pages = staticmethod(fetch_pages_concurrently)
+
+    def __init__(self, apiurl, tenant, authorization, client=None, device_index=None):
         self.apiurl = apiurl
         self.tenant = tenant
         self.authorization = authorization
+        self.client = client or RestClient(apiurl, tenant, authorization)
+        # Optional DeviceIndex consulted before looking devices up by serial number.
+        self.device_index = device_index
 
-    def _make_request(self, method, endpoint, payload=None, params=None):
-        """Helper function to make HTTP requests."""
-        url = f"{self.apiurl}{endpoint}"
-        headers = {
-            "Authorization": self.authorization,
-            "aw-tenant-code": self.tenant,
-            "Content-Type": "application/json",
-        }
-        response = requests.request(method, url, json=payload, params=params, headers=headers)
-        response.raise_for_status()
-        return response.json()
+    def _make_request(self, method, endpoint, payload=None, params=None, raw=False):
+        """Helper function to make HTTP requests; raw=True returns the undecoded body bytes."""
+        return self.client.request(method, endpoint, payload=payload, params=params, raw=raw)
 
     def create_smart_group(self, smart_group_name, user_group, managed_by_og_id):
         """Create a new Smart Group."""
@@ -37,6 +37,17 @@ class MDMRestController:
         """Retrieve device information by serial number."""
         return self._make_request("GET", f"/mdm/devices/serialnumber/{serial_number}")
 
+    def get_device_id_by_serial_number(self, serial_number):
+        """Resolve a serial number to a device ID, via the device index when one is set."""
+        if self.device_index is not None:
+            device_id = self.device_index.resolve(serial_number=serial_number)
+            if device_id is not None:
+                return device_id
+        device = self.retrieve_device_information(serial_number)
+        if self.device_index is not None:
+            self.device_index.add_records([device])
+        return str(device["Id"]["Value"])
+
     def extensive_search_device_details(self, device_id):
         """Extensive search for device details by device ID."""
         params = {"deviceid": device_id}
@@ -51,18 +62,66 @@ class MDMRestController:
         }
         return self._make_request("POST", "/mdm/products/reprocessProduct", payload)
 
-    def get_device_health_check(self, organization_group_id, page_size, page):
+    def reprocess_product_for_devices(self, device_ids, product_id):
+        """Reprocess a product on several devices in one call."""
+        payload = {
+            "ForceFlag": True,
+            "DeviceIds": [{"ID": device_id} for device_id in device_ids],
+            "ProductID": product_id,
+        }
+        return self._make_request("POST", "/mdm/products/reprocessProduct", payload)
+
+    def get_device_health_check(self, organization_group_id, page_size, page, raw=False):
         """Get a list of devices by organization group ID."""
         params = {
             "organizationgroupid": organization_group_id,
             "pagesize": page_size,
             "page": page,
         }
-        return self._make_request("GET", "/mdm/products/devicehealthcheck", params=params)
+        return self._make_request("GET", "/mdm/products/devicehealthcheck", params=params, raw=raw)
+
+    def iter_device_health_check(self, organization_group_id, page_size=500):
+        """Stream every device in an organization group, fetching pages lazily."""
+        return self._paginate(
+            lambda page: self.get_device_health_check(organization_group_id, page_size, page), "Device", page_size
+        )
+
+    def fetch_device_health_check_pages(self, organization_group_id, page_size=500, max_concurrency=8, ordered=True):
+        """Fetch page 0, then every remaining health check page concurrently.
+
+        Yields raw page bodies, in page order or as they arrive. Feed them to
+        DeviceHealthCheckDTO.from_api_response and DeviceHealthCheckDTO.merge
+        to get a single result.
+        """
+        return self._fan_out_pages(
+            lambda page: self.get_device_health_check(organization_group_id, page_size, page),
+            page_size, max_concurrency, ordered,
+        )
+
+    def search_devices(self, page_size, page, raw=False, **filters):
+        """Search devices; filters are passed through as query parameters (e.g. lgid, platform, seensince)."""
+        params = {**filters, "pagesize": page_size, "page": page}
+        return self._make_request("GET", "/mdm/devices/search", params=params, raw=raw)
+
+    def iter_devices(self, page_size=500, **filters):
+        """Stream every device matching filters, fetching pages lazily."""
+        return self._paginate(lambda page: self.search_devices(page_size, page, **filters), "Devices", page_size)
+
+    def fetch_device_search_pages(self, page_size=500, max_concurrency=8, ordered=True, **filters):
+        """Fetch page 0, then every remaining device search page concurrently.
+
+        Yields raw page bodies; merge them with DeviceSearchListDTO.merge.
+        """
+        return self._fan_out_pages(
+            lambda page: self.search_devices(page_size, page, **filters), page_size, max_concurrency, ordered
+        )
 
     def delete_device_details_by_device_id(self, device_id):
         """Delete device record by device ID."""
-        return self._make_request("DELETE", f"/mdm/devices/{device_id}")
+        response = self._make_request("DELETE", f"/mdm/devices/{device_id}")
+        if self.device_index is not None:
+            self.device_index.remove(device_id)
+        return response
 
     def delete_smart_group_by_id(self, smart_group_id):
         """Delete a smart group by ID."""
@@ -88,15 +147,28 @@ class MDMRestController:
         payload = {"CommandXml": "SoftReset"}
         return self._make_request("POST", f"/mdm/devices/{device_id}/commands", payload)
 
+    def bulk_device_command(self, command, search_by, values):
+        """Send one command to many devices in a single request (e.g. SyncDevice, LockDevice)."""
+        params = {"command": command, "searchby": search_by}
+        payload = {"BulkValues": {"Value": list(values)}}
+        return self._make_request("POST", "/mdm/devices/commands/bulk", payload, params)
+
     def activate_prod_product(self, product_id):
         """Activate a product."""
         return self._make_request("POST", f"/mdm/products/{product_id}/activate")
 
     def update_device_custom_attribute(self, device_id, attribute_name, app_group, value):
         """Update custom attribute for a device."""
-        payload = {
-            "CustomAttributes": [{"Name": attribute_name, "Value": value, "ApplicationGroup": app_group}]
-        }
+        return self.update_device_custom_attributes(
+            device_id, [{"Name": attribute_name, "Value": value, "ApplicationGroup": app_group}]
+        )
+
+    def update_device_custom_attributes(self, device_id, attributes):
+        """Update several custom attributes for a device in one call.
+
+        attributes is a list of {"Name", "Value", "ApplicationGroup"} dicts.
+        """
+        payload = {"CustomAttributes": list(attributes)}
         return self._make_request("PUT", f"/mdm/devices/{device_id}/customattributes", payload)
 
     def sync_device_by_serial_number(self, serial_number):
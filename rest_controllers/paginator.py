@@ -0,0 +1,114 @@
+import asyncio
+import contextvars
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+
+def _next_page_needed(response, records, seen, page_size):
+    """Decide from a page's Total/PageSize whether another page exists."""
+    if not records:
+        return False
+    total = response.get("Total")
+    if total is not None:
+        return seen < int(total)
+    return len(records) >= int(response.get("PageSize") or page_size)
+
+
+def iter_records(fetch_page, records_key, page_size, first_page=0):
+    """Lazily walk every page of a paged endpoint and yield its records one by one.
+
+    ``fetch_page(page)`` returns the decoded body of one page. Only one page is
+    held in memory at a time; the next page is requested once the caller has
+    consumed the current one. AirWatch page numbers start at 0.
+    """
+    page = first_page
+    seen = 0
+    while True:
+        response = fetch_page(page) or {}
+        records = response.get(records_key) or []
+        seen += len(records)
+        yield from records
+        if not _next_page_needed(response, records, seen, page_size):
+            return
+        page += 1
+
+
+async def aiter_records(fetch_page, records_key, page_size, first_page=0):
+    """Async-iterator counterpart of iter_records; ``fetch_page`` returns an awaitable."""
+    page = first_page
+    seen = 0
+    while True:
+        response = await fetch_page(page) or {}
+        records = response.get(records_key) or []
+        seen += len(records)
+        for record in records:
+            yield record
+        if not _next_page_needed(response, records, seen, page_size):
+            return
+        page += 1
+
+
+def _page_count(first, page_size):
+    """Number of pages implied by the Total/PageSize of the first page."""
+    total = first.get("Total")
+    if not total:
+        return 1
+    page_size = int(first.get("PageSize") or page_size)
+    return -(-int(total) // page_size)
+
+
+def fetch_pages_concurrently(fetch_page, page_size, max_concurrency=8, ordered=True, first_page=0):
+    """Fetch the first page, then fan the remaining pages out over a thread pool.
+
+    Yields each page's decoded body. With ``ordered`` pages come back in page
+    order; otherwise they are yielded as soon as each one arrives. At most
+    ``max_concurrency`` pages are in flight or fetched but not yet yielded,
+    so memory stays flat however many pages there are.
+    """
+    first = fetch_page(first_page) or {}
+    yield first
+    pages = iter(range(first_page + 1, first_page + _page_count(first, page_size)))
+    executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    def submit(page):
+        # A context copy per page carries the caller's Deadline into the workers.
+        return executor.submit(contextvars.copy_context().run, fetch_page, page)
+
+    try:
+        window = deque(submit(page) for page in islice(pages, max_concurrency))
+        while window:
+            if ordered:
+                future = window.popleft()
+            else:
+                future = next(iter(wait(window, return_when=FIRST_COMPLETED).done))
+                window.remove(future)
+            page = next(pages, None)
+            if page is not None:
+                window.append(submit(page))
+            yield future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+async def afetch_pages_concurrently(fetch_page, page_size, max_concurrency=8, ordered=True, first_page=0):
+    """Async counterpart of fetch_pages_concurrently; ``fetch_page`` returns an awaitable."""
+    first = await fetch_page(first_page) or {}
+    yield first
+    pages = iter(range(first_page + 1, first_page + _page_count(first, page_size)))
+    window = deque(asyncio.ensure_future(fetch_page(page)) for page in islice(pages, max_concurrency))
+    try:
+        while window:
+            if ordered:
+                task = window.popleft()
+            else:
+                done, _ = await asyncio.wait(window, return_when=asyncio.FIRST_COMPLETED)
+                task = next(iter(done))
+                window.remove(task)
+            page = next(pages, None)
+            if page is not None:
+                window.append(asyncio.ensure_future(fetch_page(page)))
+            yield await task
+    finally:
+        for task in window:
+            task.cancel()
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from endpoints import endpoint_family
+
+
+def parse_retry_after(value):
+    """Convert a Retry-After header (delta-seconds or HTTP-date) to seconds, or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Token bucket whose refill rate adapts with AIMD.
+
+    ``reserve`` takes a token and returns how long the caller must wait before
+    sending, so the lock is only held for the arithmetic and the same bucket
+    can be shared by threads (``time.sleep``) and tasks (``asyncio.sleep``).
+    """
+
+    def __init__(self, rate, burst=None, min_rate=0.5, max_rate=None, additive_increase=1.0,
+                 multiplicative_decrease=0.5):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self.min_rate = min_rate
+        self.max_rate = float(max_rate if max_rate is not None else rate)
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        # Start with a small burst; a full second's worth at once is what trips a server-side quota.
+        self._tokens = min(self.burst, max(1.0, self.rate / 10))
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._last_cut = float("-inf")
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take one token and return the number of seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def on_success(self):
+        """Additive increase: gain roughly ``additive_increase`` req/s per second of traffic."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.additive_increase / self.rate)
+
+    def on_throttle(self, retry_after=None):
+        """Multiplicative decrease, and hold every caller until Retry-After has passed.
+
+        Requests sent together are throttled together, so the rate is cut at
+        most once per congestion event: 429s that arrive while callers are
+        still held, or within one refill interval of the last cut, only
+        extend the hold.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._blocked_until and now - self._last_cut >= 1 / self.rate:
+                self.rate = max(self.min_rate, self.rate * self.multiplicative_decrease)
+                self._last_cut = now
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+
+class RateLimiter:
+    """Client-side rate limiter with one adaptive token bucket per endpoint family.
+
+    Create one per tenant and share it between that tenant's RestClient and
+    AsyncRestClient. ``family_rates`` overrides ``rate`` (requests/second) for
+    individual families, e.g. ``{"/mam": 5, "/system": 20}``. Throughput
+    ramps up to ``max_rate`` (default: the configured rate) while calls
+    succeed and is cut back on every 429.
+    """
+
+    def __init__(self, rate=10, family_rates=None, burst=None, min_rate=0.5, max_rate=None,
+                 additive_increase=1.0, multiplicative_decrease=0.5):
+        self.rate = rate
+        self.family_rates = family_rates or {}
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, endpoint):
+        """Return the bucket for an endpoint's family, creating it on first use."""
+        family = endpoint_family(endpoint)
+        with self._lock:
+            bucket = self._buckets.get(family)
+            if bucket is None:
+                rate = self.family_rates.get(family, self.rate)
+                bucket = self._buckets[family] = TokenBucket(
+                    rate, self.burst, self.min_rate, self.max_rate, self.additive_increase,
+                    self.multiplicative_decrease,
+                )
+            return bucket
+
+    def acquire(self, endpoint):
+        """Block the calling thread until a request to endpoint may be sent."""
+        wait = self.bucket(endpoint).reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, endpoint):
+        """Suspend the calling task until a request to endpoint may be sent."""
+        wait = self.bucket(endpoint).reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self, endpoint):
+        self.bucket(endpoint).on_success()
+
+    def on_throttle(self, endpoint, retry_after=None):
+        self.bucket(endpoint).on_throttle(retry_after)
+
+    def rates(self):
+        """Current requests/second per endpoint family."""
+        with self._lock:
+            return {family: bucket.rate for family, bucket in self._buckets.items()}
@@ -0,0 +1,152 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+
+from endpoints import endpoint_template
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is +Inf.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class _EndpointStats:
+    __slots__ = ("buckets", "count", "latency_sum", "bytes_in", "bytes_out", "statuses", "retries", "in_flight")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.latency_sum = 0.0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.statuses = {}
+        self.retries = 0
+        self.in_flight = 0
+
+    def percentile(self, quantile):
+        """Estimate a latency percentile by interpolating inside the histogram bucket it falls in."""
+        if not self.count:
+            return None
+        rank = quantile * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.buckets):
+            if cumulative + bucket_count >= rank and bucket_count:
+                lower = LATENCY_BUCKETS[index - 1] if index else 0.0
+                upper = LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else LATENCY_BUCKETS[-1]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return LATENCY_BUCKETS[-1]
+
+
+class RequestMetrics:
+    """Per-endpoint-template request metrics for RestClient and AsyncRestClient.
+
+    Records a fixed-bucket latency histogram (p50/p95/p99 are estimated from
+    it), bytes in and out, status codes, retries and in-flight calls for each
+    (method, endpoint template) pair. Each hook is a dict lookup and a few
+    increments under one lock, so it is cheap enough to leave enabled.
+    Any object with the same ``on_request_start``/``on_request_end``/
+    ``on_retry`` methods can be passed to the clients instead.
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _get(self, method, endpoint):
+        key = (method, endpoint_template(endpoint))
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _EndpointStats()
+        return stats
+
+    def on_request_start(self, method, endpoint):
+        """Mark a call as in flight and return the token to pass to on_request_end."""
+        with self._lock:
+            self._get(method, endpoint).in_flight += 1
+        return time.perf_counter()
+
+    def on_request_end(self, method, endpoint, started, status, bytes_in=0, bytes_out=0):
+        """Record a finished call; status is the HTTP status code or "error"."""
+        latency = time.perf_counter() - started
+        with self._lock:
+            stats = self._get(method, endpoint)
+            stats.in_flight -= 1
+            stats.count += 1
+            stats.latency_sum += latency
+            stats.buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+            stats.bytes_in += bytes_in
+            stats.bytes_out += bytes_out
+            stats.statuses[str(status)] = stats.statuses.get(str(status), 0) + 1
+
+    def on_retry(self, method, endpoint):
+        with self._lock:
+            self._get(method, endpoint).retries += 1
+
+    def snapshot(self):
+        """Return a point-in-time dict of metrics keyed by "METHOD /endpoint/template"."""
+        with self._lock:
+            return {
+                f"{method} {template}": {
+                    "count": stats.count,
+                    "p50": stats.percentile(0.50),
+                    "p95": stats.percentile(0.95),
+                    "p99": stats.percentile(0.99),
+                    "mean": stats.latency_sum / stats.count if stats.count else None,
+                    "bytes_in": stats.bytes_in,
+                    "bytes_out": stats.bytes_out,
+                    "statuses": dict(stats.statuses),
+                    "retries": stats.retries,
+                    "in_flight": stats.in_flight,
+                }
+                for (method, template), stats in self._stats.items()
+            }
+
+    def percentile(self, method, endpoint, quantile):
+        """Estimated latency percentile for one endpoint's template, or None before any call."""
+        with self._lock:
+            stats = self._stats.get((method, endpoint_template(endpoint)))
+            return stats.percentile(quantile) if stats is not None else None
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix="airwatch"):
+        """Render the metrics in the Prometheus text exposition format."""
+        families = {
+            "request_duration_seconds": ("histogram", []),
+            "requests_total": ("counter", []),
+            "request_bytes_in_total": ("counter", []),
+            "request_bytes_out_total": ("counter", []),
+            "request_retries_total": ("counter", []),
+            "requests_in_flight": ("gauge", []),
+        }
+
+        def sample(family, labels, value, suffix=""):
+            families[family][1].append(f"{prefix}_{family}{suffix}{{{labels}}} {value}")
+
+        with self._lock:
+            for (method, template), stats in sorted(self._stats.items()):
+                labels = f'method="{_escape_label(method)}",endpoint="{_escape_label(template)}"'
+                cumulative = 0
+                for bound, bucket_count in zip(LATENCY_BUCKETS + ("+Inf",), stats.buckets):
+                    cumulative += bucket_count
+                    sample("request_duration_seconds", f'{labels},le="{bound}"', cumulative, "_bucket")
+                sample("request_duration_seconds", labels, stats.latency_sum, "_sum")
+                sample("request_duration_seconds", labels, stats.count, "_count")
+                for status, status_count in sorted(stats.statuses.items()):
+                    sample("requests_total", f'{labels},status="{_escape_label(status)}"', status_count)
+                sample("request_bytes_in_total", labels, stats.bytes_in)
+                sample("request_bytes_out_total", labels, stats.bytes_out)
+                sample("request_retries_total", labels, stats.retries)
+                sample("requests_in_flight", labels, stats.in_flight)
+        # Each family is one block: its TYPE line followed by all of its samples.
+        lines = []
+        for family, (metric_type, samples) in families.items():
+            lines.append(f"# TYPE {prefix}_{family} {metric_type}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value):
+    """Escape a Prometheus label value (backslash, double quote and newline)."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
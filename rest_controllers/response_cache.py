@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+def resource_of(endpoint):
+    """Return the resource collection an endpoint belongs to, e.g. ("mam", "apps")."""
+    path = endpoint.split("?", 1)[0]
+    return tuple(path.strip("/").split("/")[:2])
+
+
+class ResponseCache:
+    """Thread-safe, size-bounded LRU cache for idempotent GET responses.
+
+    ``ttls`` maps endpoint prefixes (e.g. ``"/system/groups/search"``) to a
+    time-to-live in seconds; the longest matching prefix wins and anything
+    unmatched uses ``default_ttl``. A TTL of 0 disables caching for that
+    prefix. Cached bodies are shared between callers and must be treated as
+    read-only.
+    """
+
+    def __init__(self, max_entries=1024, default_ttl=60, ttls=None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.ttls = sorted((ttls or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(endpoint, params=None):
+        """Build a cache key from the endpoint and its query parameters."""
+        query = tuple(sorted((key, str(value)) for key, value in (params or {}).items() if value is not None))
+        return endpoint, query
+
+    def ttl_for(self, endpoint):
+        """TTL in seconds for an endpoint, from the longest matching prefix."""
+        for prefix, ttl in self.ttls:
+            if endpoint.startswith(prefix):
+                return ttl
+        return self.default_ttl
+
+    def get(self, key):
+        """Return ``(True, body)`` on a fresh hit, else ``(False, None)``."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def set(self, key, body):
+        """Store a response body, evicting the least recently used entries past max_entries."""
+        ttl = self.ttl_for(key[0])
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, endpoint):
+        """Drop every cached GET in the same resource collection as a mutating call."""
+        resource = resource_of(endpoint)
+        with self._lock:
+            stale = [key for key in self._entries if resource_of(key[0]) == resource]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+            }
@@ -0,0 +1,282 @@
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from json_codec import get_decoder
+from rate_limiter import parse_retry_after
+from response_cache import ResponseCache
+from timeouts import DeadlineExceededError, Timeouts, current_deadline
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(apiurl, tenant, pool_connections=10, pool_maxsize=32, pool_block=False, pool_key=None):
+    """Return the shared keep-alive session for a tenant, creating it on first use.
+
+    One session (and therefore one urllib3 connection pool) exists per
+    (apiurl, tenant) pair, so every controller talking to the same tenant
+    reuses the same TCP/TLS connections. Pool sizes only apply the first time
+    a tenant's session is created. A ``pool_key`` gives its holders a
+    separate session of their own for the same tenant.
+    """
+    key = (apiurl, tenant, pool_key)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=pool_block,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({
+                "aw-tenant-code": tenant,
+                "Content-Type": "application/json",
+                "Connection": "keep-alive",
+            })
+            _sessions[key] = session
+        return session
+
+
+def close_session(apiurl, tenant, pool_key=None):
+    """Close one tenant's pooled session (the one for ``pool_key``), if it exists."""
+    with _sessions_lock:
+        session = _sessions.pop((apiurl, tenant, pool_key), None)
+    if session is not None:
+        session.close()
+
+
+def close_sessions():
+    """Close every pooled session and drop it from the registry."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+class RestClient:
+    """Shared HTTP layer used by the MDM, MAM and SYS controllers.
+
+    Pass a ResponseCache as ``cache`` to serve repeated GETs locally; any
+    successful PUT/POST/DELETE invalidates cached GETs on the same resource.
+    Pass a SingleFlight as ``single_flight`` to collapse identical GETs issued
+    concurrently from several threads into one upstream request.
+
+    A 429 is retried up to ``max_throttle_retries`` times after waiting for
+    its Retry-After. With a RateLimiter every call first waits for a token
+    from its endpoint family's bucket, and 429s slow that bucket down.
+
+    ``circuit_breakers`` (a CircuitBreakerRegistry) makes calls to a family
+    that keeps failing with 5xx or connection errors fail fast, and
+    ``bulkhead`` (a Bulkhead) caps concurrent calls per family so one slow
+    family cannot occupy every worker.
+
+    ``metrics`` (a RequestMetrics, or any object with the same hooks) is
+    told about every HTTP attempt: latency, status, bytes and retries.
+
+    Bodies are decoded with ``decoder`` (a name from json_codec.DECODERS or
+    any callable taking bytes; default: the fastest installed). Pass
+    ``raw=True`` to request() to get the undecoded body as bytes instead, e.g.
+    for a DTO's from_api_bytes.
+
+    Every call has connect and read timeouts from ``timeouts`` (a Timeouts,
+    per endpoint family), capped by the Deadline the caller runs under. Once
+    the deadline has passed, calls raise DeadlineExceededError without being
+    sent, and 429s are not retried if the wait would outlast it. A timeout
+    cut short by the deadline also raises DeadlineExceededError and is not
+    counted against the circuit breaker.
+
+    ``hedging`` (a HedgingPolicy) sends a second copy of a slow GET once it
+    has run past the endpoint's usual p95 and returns whichever answers first.
+
+    ``authorization`` is either a static header value or a token provider
+    (e.g. ClientCredentialsTokenProvider) asked for the header on every call;
+    with a provider, a 401 is replayed once after invalidating the token.
+    """
+
+    def __init__(self, apiurl, tenant, authorization, pool_connections=10, pool_maxsize=32, pool_block=False,
+                 cache=None, single_flight=None, rate_limiter=None, max_throttle_retries=3,
+                 circuit_breakers=None, bulkhead=None, metrics=None, decoder=None, timeouts=None,
+                 hedging=None, pool_key=None):
+        self.apiurl = apiurl
+        self.tenant = tenant
+        self.authorization = authorization
+        self.session = get_session(apiurl, tenant, pool_connections, pool_maxsize, pool_block, pool_key)
+        self.token_provider = None if isinstance(authorization, str) else authorization
+        self.headers = {"Authorization": authorization} if self.token_provider is None else {}
+        self.cache = cache
+        self.single_flight = single_flight
+        self.rate_limiter = rate_limiter
+        self.max_throttle_retries = max_throttle_retries
+        self.circuit_breakers = circuit_breakers
+        self.bulkhead = bulkhead
+        self.metrics = metrics
+        self.decode = get_decoder(decoder)
+        self.timeouts = timeouts or Timeouts()
+        self.hedging = hedging
+
+    def _build_headers(self, headers):
+        """Merge per-call headers over the prebuilt client headers."""
+        if self.token_provider is not None:
+            return {"Authorization": self.token_provider.authorization(), **(headers or {})}
+        if not headers:
+            return self.headers
+        return {**self.headers, **headers}
+
+    def request(self, method, endpoint, payload=None, params=None, files=None, headers=None, raw=False):
+        """Send a request over the tenant's pooled session and return the decoded JSON body (bytes if raw)."""
+        if method != "GET":
+            body = self._send(method, endpoint, payload, params, files, headers, raw)
+            if self.cache is not None:
+                self.cache.invalidate(endpoint)
+            return body
+        key = ResponseCache.make_key(endpoint, params)
+        if raw:
+            key += ("raw",)
+        if self.cache is not None:
+            hit, body = self.cache.get(key)
+            if hit:
+                return body
+        if self.single_flight is not None:
+            body = self.single_flight.do(
+                key, lambda: self._send(method, endpoint, payload, params, files, headers, raw)
+            )
+        else:
+            body = self._send(method, endpoint, payload, params, files, headers, raw)
+        if self.cache is not None:
+            self.cache.set(key, body)
+        return body
+
+    def _send(self, method, endpoint, payload, params, files, headers, raw=False, stream=False):
+        """Send one call through the bulkhead and circuit breaker and decode the response.
+
+        With ``stream=True`` the response is returned with its body unread; the caller must close it.
+        """
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.check()
+        # Checked before queueing for a bulkhead slot so an open circuit fails fast.
+        breaker = self.circuit_breakers.breaker(endpoint) if self.circuit_breakers is not None else None
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            with self.bulkhead.limit(endpoint) if self.bulkhead is not None else nullcontext():
+                response = self._attempt(method, endpoint, payload, params, files, headers, stream)
+        except requests.RequestException as e:
+            if isinstance(e, requests.Timeout) and deadline is not None and deadline.expired():
+                # The timeout was cut short by the job's deadline, not by a slow upstream.
+                if breaker is not None:
+                    breaker.release()
+                raise DeadlineExceededError("Job deadline exceeded") from e
+            if breaker is not None:
+                breaker.on_failure()
+            raise
+        except BaseException:
+            # Deadline, token, bulkhead and other local errors say nothing about the upstream;
+            # give back a half-open trial slot so the circuit is not stuck half-open.
+            if breaker is not None:
+                breaker.release()
+            raise
+        if breaker is not None:
+            if response.status_code >= 500:
+                breaker.on_failure()
+            else:
+                breaker.on_success()
+        if stream and not response.ok:
+            response.close()
+        response.raise_for_status()  # Raise an HTTPError for bad responses (4xx and 5xx)
+        if self.rate_limiter is not None:
+            self.rate_limiter.on_success(endpoint)
+        if stream:
+            return response
+        if raw:
+            return response.content
+        try:
+            return self.decode(response.content)
+        except ValueError:
+            # Re-decode with requests so callers keep getting requests' JSONDecodeError.
+            return response.json()
+
+    def _attempt(self, method, endpoint, payload, params, files, headers, stream=False):
+        """Run the exchange, hedged when the hedging policy covers the call."""
+        # A streamed body is read after this returns, so a losing hedge could not be cleaned up.
+        if self.hedging is not None and not stream and self.hedging.applies(method, endpoint):
+            return self.hedging.run(
+                method, endpoint, lambda: self._exchange(method, endpoint, payload, params, files, headers)
+            )
+        return self._exchange(method, endpoint, payload, params, files, headers, stream)
+
+    def _exchange(self, method, endpoint, payload, params, files, headers, stream=False):
+        """Perform the HTTP round trip, replaying it once with a fresh token after a 401."""
+        response = self._throttled_exchange(method, endpoint, payload, params, files, headers, stream)
+        if response.status_code == 401 and self.token_provider is not None:
+            self.token_provider.invalidate(response.request.headers.get("Authorization"))
+            response.close()
+            for file in (files or {}).values():
+                file.seek(0)
+            response = self._throttled_exchange(method, endpoint, payload, params, files, headers, stream)
+        return response
+
+    def _throttled_exchange(self, method, endpoint, payload, params, files, headers, stream=False):
+        """Send the request, retrying throttled (429) responses."""
+        url = f"{self.apiurl}{endpoint}"
+        for attempt in range(self.max_throttle_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(endpoint)
+            response = self._round_trip(
+                method, endpoint, url, json=payload, params=params, files=files, headers=self._build_headers(headers),
+                timeout=self.timeouts.for_endpoint(endpoint), stream=stream,
+            )
+            if response.status_code != 429 or attempt == self.max_throttle_retries:
+                break
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            delay = retry_after if retry_after is not None else 2 ** attempt
+            deadline = current_deadline()
+            if deadline is not None and delay >= deadline.remaining():
+                break  # Waiting out the throttle would overrun the job's deadline.
+            response.close()
+            if self.metrics is not None:
+                self.metrics.on_retry(method, endpoint)
+            if self.rate_limiter is not None:
+                self.rate_limiter.on_throttle(endpoint, retry_after)
+            else:
+                time.sleep(delay)
+            for file in (files or {}).values():
+                file.seek(0)
+        return response
+
+    def _round_trip(self, method, endpoint, url, **kwargs):
+        """Send a single HTTP request, reporting it to the metrics hook when one is set."""
+        if self.metrics is None:
+            return self.session.request(method, url, **kwargs)
+        started = self.metrics.on_request_start(method, endpoint)
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception:
+            self.metrics.on_request_end(method, endpoint, started, "error")
+            raise
+        body = response.request.body
+        bytes_out = len(body) if isinstance(body, (bytes, str)) else 0
+        bytes_in = 0 if kwargs.get("stream") else len(response.content)
+        self.metrics.on_request_end(method, endpoint, started, response.status_code, bytes_in, bytes_out)
+        return response
+
+    @contextmanager
+    def stream(self, method, endpoint, params=None, headers=None):
+        """Send a request and yield the undecoded, file-like response body for incremental parsing.
+
+        The call goes through the same deadline check, bulkhead, circuit
+        breaker, rate limiter, 429 retries and 401 replay as request().
+        """
+        response = self._send(method, endpoint, None, params, None, headers, stream=True)
+        try:
+            response.raw.decode_content = True
+            yield response.raw
+        finally:
+            response.close()
@@ -1,29 +1,48 @@
 import requests
 
+from directory_keys import USER, USER_GROUP, user_group_id
+from json_stream import iter_json_items
+from paginator import iter_records
+from rest_client import RestClient
+
 
 class SYSRestController:
-    def __init__(self, apiurl, tenant, authorization):
+    # Sent on every SYS call in addition to the client's default headers.
+    extra_headers = {"Cache-Control": "no-cache"}
+    # Drives the iter_* methods; async subclasses swap in aiter_records.
+    _paginate = staticmethod(iter_records)
+
+    def __init__(self, apiurl, tenant, authorization, client=None, directory_index=None):
         self.apiurl = apiurl
         self.tenant = tenant
         self.authorization = authorization
-
-    def _make_request(self, method, endpoint, payload=None, params=None):
-        """Helper function to handle HTTP requests."""
-        url = f"{self.apiurl}{endpoint}"
-        headers = {
-            "Authorization": self.authorization,
-            "aw-tenant-code": self.tenant,
-            "Content-Type": "application/json",
-            "Cache-Control": "no-cache",
-        }
-        response = requests.request(method, url, json=payload, params=params, headers=headers)
-        response.raise_for_status()
-        return response.json()
-
-    def search_custom_user_group_with_params(self, name):
+        self.client = client or RestClient(apiurl, tenant, authorization)
+        # Optional DirectoryIndex consulted before resolving user and user group names.
+        self.directory_index = directory_index
+
+    def _invalidate_directory_entry(self, response, kind, name):
+        """Drop a name from the directory index once a create call for it has succeeded."""
+        if self.directory_index is not None:
+            self.directory_index.invalidate(kind, name)
+        return response
+
+    def _make_request(self, method, endpoint, payload=None, params=None, raw=False):
+        """Helper function to handle HTTP requests; raw=True returns the undecoded body bytes."""
+        return self.client.request(
+            method, endpoint, payload=payload, params=params, headers=self.extra_headers, raw=raw
+        )
+
+    def search_custom_user_group_with_params(self, name, page_size=None, page=None):
         """Search for custom user groups by name."""
         endpoint = f"/system/usergroups/custom/search?groupname={name}"
-        return self._make_request("GET", endpoint)
+        params = {"pagesize": page_size, "page": page}
+        return self._make_request("GET", endpoint, params=params)
+
+    def iter_custom_user_groups(self, name="", page_size=500):
+        """Stream every custom user group matching name, fetching pages lazily."""
+        return self._paginate(
+            lambda page: self.search_custom_user_group_with_params(name, page_size, page), "UserGroup", page_size
+        )
 
     def create_custom_user_group(self, group_name, organization_group):
         """Create a custom user group."""
@@ -33,17 +52,102 @@ class SYSRestController:
             "Description": f"EMA generated User Group. Created on: {requests.utils.formatdate()}",
             "ManagedByOrganizationGroupID": organization_group,
         }
-        return self._make_request("POST", endpoint, payload=payload)
+        return self._invalidate_directory_entry(
+            self._make_request("POST", endpoint, payload=payload), USER_GROUP, group_name
+        )
 
     def retrieve_list_of_users_from_custom_user_group_id(self, user_group_id):
-        """Retrieve users in a custom user group by group ID."""
+        """Retrieve users in a custom user group by group ID.
+
+        Loads the whole group in one response; use
+        stream_users_from_custom_user_group_id for large groups.
+        """
         endpoint = f"/system/usergroups/{user_group_id}/users?pagesize=20000"
         return self._make_request("GET", endpoint)
 
-    def search_for_enrollment_user(self, username):
+    def list_users_in_custom_user_group(self, user_group_id, page_size, page, raw=False):
+        """Retrieve one page of users in a custom user group."""
+        endpoint = f"/system/usergroups/{user_group_id}/users"
+        params = {"pagesize": page_size, "page": page}
+        return self._make_request("GET", endpoint, params=params, raw=raw)
+
+    def iter_users_in_custom_user_group(self, user_group_id, page_size=500):
+        """Stream every user in a custom user group, fetching pages lazily."""
+        return self._paginate(
+            lambda page: self.list_users_in_custom_user_group(user_group_id, page_size, page),
+            "EnrollmentUser",
+            page_size,
+        )
+
+    def stream_users_from_custom_user_group_id(self, user_group_id, page_size=500):
+        """Yield the users of a custom user group one at a time.
+
+        Pages through the membership and parses each response body
+        incrementally, so peak memory does not grow with the group size.
+        """
+        endpoint = f"/system/usergroups/{user_group_id}/users"
+        page = 0
+        largest_page = 0
+        while True:
+            count = 0
+            params = {"pagesize": page_size, "page": page}
+            with self.client.stream("GET", endpoint, params=params, headers=self.extra_headers) as body:
+                for user in iter_json_items(body, "EnrollmentUser"):
+                    count += 1
+                    yield user
+            # The server may cap pagesize below page_size, so only an empty page, or one shorter
+            # than an earlier page, marks the end.
+            if count == 0 or count < largest_page:
+                return
+            largest_page = count
+            page += 1
+
+    def search_for_enrollment_user(self, username, page_size=None, page=None, raw=False):
         """Search for an enrollment user by username."""
         endpoint = f"/system/users/search?username={username}"
-        return self._make_request("GET", endpoint)
+        params = {"pagesize": page_size, "page": page}
+        return self._make_request("GET", endpoint, params=params, raw=raw)
+
+    def iter_enrollment_users(self, username="", page_size=500):
+        """Stream every enrollment user matching username, fetching pages lazily."""
+        return self._paginate(
+            lambda page: self.search_for_enrollment_user(username, page_size, page), "Users", page_size
+        )
+
+    def resolve_user_id(self, username):
+        """Resolve a username to a user ID (None if it does not exist), via the directory index when set."""
+        if self.directory_index is not None:
+            found, user_id = self.directory_index.get(USER, username)
+            if found:
+                return user_id
+        # The search matches substrings, so walk every page before recording a miss.
+        user_id = next((
+            user["Id"]["Value"] for user in self.iter_enrollment_users(username)
+            if user.get("UserName", "").lower() == username.lower()
+        ), None)
+        return self._record_resolution(USER, username, user_id)
+
+    def resolve_user_group_id(self, group_name):
+        """Resolve a custom user group name to its ID (None if it does not exist), via the directory index when set."""
+        if self.directory_index is not None:
+            found, group_id = self.directory_index.get(USER_GROUP, group_name)
+            if found:
+                return group_id
+        group_id = next((
+            user_group_id(group) for group in self.iter_custom_user_groups(group_name)
+            if group.get("UserGroupName", "").lower() == group_name.lower()
+        ), None)
+        return self._record_resolution(USER_GROUP, group_name, group_id)
+
+    def _record_resolution(self, kind, name, match):
+        """Store a lookup result (or a negative entry) in the directory index and return the ID."""
+        entry_id = str(match) if match is not None else None
+        if self.directory_index is not None:
+            if entry_id is None:
+                self.directory_index.put_missing(kind, name)
+            else:
+                self.directory_index.put(kind, name, entry_id)
+        return entry_id
 
     def register_device_to_enrollment_user(self, user_id, first_name, location_group_id, ownership, message_id):
         """Register a device to an enrollment user."""
@@ -91,7 +195,12 @@ class SYSRestController:
             "Role": "Basic Access",
             "MessageType": "None",
         }
-        return self._make_request("POST", endpoint, payload=payload)
+        return self._invalidate_directory_entry(self._make_request("POST", endpoint, payload=payload), USER, username)
+
+    def get_organization_group(self, location_group_id):
+        """Get an organization group by location group ID."""
+        endpoint = f"/system/groups/{location_group_id}"
+        return self._make_request("GET", endpoint)
 
     def get_children_organization_groups_from_parent(self, location_group_id):
         """Get all child organization groups from parent location group ID."""
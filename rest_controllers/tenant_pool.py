@@ -0,0 +1,171 @@
+import threading
+
+from async_mam_rest_controller import AsyncMAMRestController
+from async_mdm_rest_controller import AsyncMDMRestController
+from async_rest_client import AsyncRestClient, discard_async_sessions
+from async_sys_rest_controller import AsyncSYSRestController
+from bulkhead import Bulkhead
+from circuit_breaker import CircuitBreakerRegistry
+from mam_rest_controller import MAMRestController
+from mdm_rest_controller import MDMRestController
+from rate_limiter import RateLimiter
+from rest_client import RestClient, close_session
+from sys_rest_controller import SYSRestController
+
+
+class TenantControllers:
+    """The MDM, SYS and MAM controllers of one tenant, sharing one client."""
+
+    def __init__(self, client, mdm, sys, mam):
+        self.client = client
+        self.mdm = mdm
+        self.sys = sys
+        self.mam = mam
+
+
+class _Tenant:
+    def __init__(self, apiurl, tenant, authorization, rate, family_rates, max_concurrent, family_limits,
+                 max_wait, pool_maxsize, client_options):
+        self.apiurl = apiurl
+        self.tenant = tenant
+        self.authorization = authorization
+        self.pool_maxsize = pool_maxsize
+        self.client_options = client_options
+        # Shared by the tenant's sync and async controllers, so both draw on one budget.
+        self.rate_limiter = RateLimiter(rate, family_rates)
+        self.bulkhead = Bulkhead(max_concurrent, family_limits, max_wait)
+        self.circuit_breakers = CircuitBreakerRegistry()
+        self.controllers = None
+        self.async_controllers = None
+
+    def client_kwargs(self):
+        return {
+            # Keyed by this registration, so the tenant gets its own connection pool of pool_maxsize
+            # even if another client already opened a session for the same apiurl and tenant code.
+            "pool_key": self,
+            "rate_limiter": self.rate_limiter,
+            "bulkhead": self.bulkhead,
+            "circuit_breakers": self.circuit_breakers,
+            **self.client_options,
+        }
+
+    def close(self):
+        """Close the connection pools opened for this registration."""
+        close_session(self.apiurl, self.tenant, self)
+        discard_async_sessions(self)
+
+
+class TenantControllerPool:
+    """Lazily built, reused controllers for several AirWatch tenants.
+
+    Register each tenant once under a name, then ask for its controllers:
+
+        pool = TenantControllerPool()
+        pool.register("emea", "https://as1.awmdm.com/api", "emea-code", "Basic ...", rate=20)
+        pool.get("emea").mdm.get_product_info(1)
+
+    Every tenant has its own connection pool (``pool_maxsize`` connections),
+    RateLimiter (``rate`` requests/second, ``family_rates`` per family),
+    Bulkhead (``max_concurrent`` calls in flight per family) and circuit
+    breakers, so a tenant that is slow, throttled or failing cannot use up
+    another tenant's connections, request rate or worker slots. Any other
+    RestClient/AsyncRestClient option (cache, metrics, timeouts, hedging,
+    decoder, ...) can be passed to register() and applies to that tenant.
+    Call close() when done with the pool to release those connections.
+    """
+
+    def __init__(self, default_rate=10, default_max_concurrent=10, default_pool_maxsize=32):
+        self.default_rate = default_rate
+        self.default_max_concurrent = default_max_concurrent
+        self.default_pool_maxsize = default_pool_maxsize
+        self._tenants = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, **defaults):
+        """Build a pool from ``{name: {"apiurl": ..., "tenant": ..., "authorization": ..., **options}}``."""
+        pool = cls(**defaults)
+        for name, options in config.items():
+            pool.register(name, **options)
+        return pool
+
+    def register(self, name, apiurl, tenant, authorization, rate=None, family_rates=None, max_concurrent=None,
+                 family_limits=None, max_wait=5.0, pool_maxsize=None, **client_options):
+        """Add a tenant; its controllers are created on first use.
+
+        Re-registering a name replaces it and closes the old registration's connections.
+        """
+        with self._lock:
+            previous = self._tenants.get(name)
+            self._tenants[name] = _Tenant(
+                apiurl, tenant, authorization,
+                rate if rate is not None else self.default_rate,
+                family_rates,
+                max_concurrent if max_concurrent is not None else self.default_max_concurrent,
+                family_limits,
+                max_wait,
+                pool_maxsize if pool_maxsize is not None else self.default_pool_maxsize,
+                client_options,
+            )
+        if previous is not None:
+            previous.close()
+
+    def _tenant(self, name):
+        tenant = self._tenants.get(name)
+        if tenant is None:
+            raise KeyError(f"Unknown tenant {name!r}; registered: {', '.join(sorted(self._tenants)) or 'none'}")
+        return tenant
+
+    def get(self, name):
+        """Return the tenant's blocking controllers, creating them on first use."""
+        with self._lock:
+            tenant = self._tenant(name)
+            if tenant.controllers is None:
+                client = RestClient(
+                    tenant.apiurl, tenant.tenant, tenant.authorization, pool_maxsize=tenant.pool_maxsize,
+                    **tenant.client_kwargs(),
+                )
+                tenant.controllers = TenantControllers(
+                    client,
+                    MDMRestController(tenant.apiurl, tenant.tenant, tenant.authorization, client=client),
+                    SYSRestController(tenant.apiurl, tenant.tenant, tenant.authorization, client=client),
+                    MAMRestController(tenant.apiurl, tenant.tenant, tenant.authorization, client=client),
+                )
+            return tenant.controllers
+
+    def get_async(self, name):
+        """Return the tenant's asyncio controllers, creating them on first use."""
+        with self._lock:
+            tenant = self._tenant(name)
+            if tenant.async_controllers is None:
+                client = AsyncRestClient(
+                    tenant.apiurl, tenant.tenant, tenant.authorization, max_concurrency=tenant.pool_maxsize,
+                    **tenant.client_kwargs(),
+                )
+                tenant.async_controllers = TenantControllers(
+                    client,
+                    AsyncMDMRestController(tenant.apiurl, tenant.tenant, tenant.authorization, client=client),
+                    AsyncSYSRestController(tenant.apiurl, tenant.tenant, tenant.authorization, client=client),
+                    AsyncMAMRestController(tenant.apiurl, tenant.tenant, tenant.authorization, client=client),
+                )
+            return tenant.async_controllers
+
+    def close(self):
+        """Close every tenant's connection pools and forget the registered tenants."""
+        with self._lock:
+            tenants, self._tenants = list(self._tenants.values()), {}
+        for tenant in tenants:
+            tenant.close()
+
+    def tenants(self):
+        """Names of the registered tenants."""
+        with self._lock:
+            return sorted(self._tenants)
+
+    def budgets(self):
+        """Current per-family request rates and circuit states for every tenant."""
+        with self._lock:
+            return {
+                name: {"rates": tenant.rate_limiter.rates(), "circuits": tenant.circuit_breakers.states()}
+                for name, tenant in self._tenants.items()
+            }
@@ -0,0 +1,89 @@
+import contextvars
+import time
+from functools import wraps
+
+from endpoints import endpoint_family
+
+_current_deadline = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceededError(Exception):
+    """Raised when a call is attempted after the job's deadline has passed."""
+
+
+class Deadline:
+    """A time budget for a whole job, shared by every controller call made inside it.
+
+    Use it as a context manager (``with Deadline(300): ...``); the REST
+    clients cap each call's timeouts to the time remaining and refuse to
+    start calls once it is spent. Nesting a deadline can only shorten the
+    outer one. Context variables do not follow work into thread pools, so
+    submit with ``deadline.wrap(fn)``; asyncio tasks inherit it on their own.
+    """
+
+    def __init__(self, budget):
+        self.expires_at = time.monotonic() + budget
+        self._tokens = []
+
+    def remaining(self):
+        """Seconds left, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return time.monotonic() >= self.expires_at
+
+    def check(self):
+        """Raise DeadlineExceededError if the budget is spent."""
+        if self.expired():
+            raise DeadlineExceededError("Job deadline exceeded")
+
+    def __enter__(self):
+        outer = _current_deadline.get()
+        if outer is not None and outer.expires_at < self.expires_at:
+            self.expires_at = outer.expires_at
+        self._tokens.append(_current_deadline.set(self))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_deadline.reset(self._tokens.pop())
+
+    def wrap(self, fn):
+        """Return fn wrapped to run inside this deadline, e.g. for ThreadPoolExecutor.submit."""
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            # Set the variable directly: the wrapper may run on many threads at once.
+            token = _current_deadline.set(self)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _current_deadline.reset(token)
+        return wrapper
+
+
+def current_deadline():
+    """The Deadline the caller is running under, or None."""
+    return _current_deadline.get()
+
+
+class Timeouts:
+    """Connect and read timeouts, in seconds, per endpoint family.
+
+    ``family_timeouts`` maps a family ("/mdm", "/mam", "/system") to a
+    ``(connect, read)`` pair; other families use ``connect`` and ``read``.
+    The read timeout bounds each wait for data, not the whole response.
+    """
+
+    def __init__(self, connect=5.0, read=60.0, family_timeouts=None):
+        self.connect = connect
+        self.read = read
+        self.family_timeouts = family_timeouts or {}
+
+    def for_endpoint(self, endpoint):
+        """Return ``(connect, read)`` for an endpoint, capped by the current deadline."""
+        connect, read = self.family_timeouts.get(endpoint_family(endpoint), (self.connect, self.read))
+        deadline = current_deadline()
+        if deadline is None:
+            return connect, read
+        deadline.check()
+        remaining = deadline.remaining()
+        return min(connect, remaining), min(read, remaining)
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import threading
+import time
+
+import requests
+
+
+class TokenError(Exception):
+    """Raised when the token endpoint does not return a usable access token."""
+
+
+class ClientCredentialsTokenProvider:
+    """OAuth client-credentials tokens shared by every controller of a tenant.
+
+    Pass one provider as ``authorization`` to the MDM, MAM and SYS
+    controllers (or to RestClient/AsyncRestClient) in place of a static
+    header. Tokens are cached until ``refresh_margin`` seconds before they
+    expire; a background thread renews them ahead of that, so calls rarely
+    wait. When a refresh is needed on the call path, concurrent callers
+    share a single token request. After a 401 the clients call invalidate()
+    and replay the request once with a fresh token.
+    """
+
+    def __init__(self, token_url, client_id, client_secret, scope=None, refresh_margin=300, timeout=(5, 30),
+                 background_refresh=True):
+        self.token_url = token_url
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.scope = scope
+        self.refresh_margin = refresh_margin
+        self.timeout = timeout
+        self.background_refresh = background_refresh
+        self._header = None
+        self._stale_at = 0.0
+        self._refresh_at = 0.0
+        # _lock only guards the cached header; the token request itself runs under _refresh_lock, so
+        # invalidate() (called on the event loop by the async client) never waits on the network.
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._refresher = None
+        self.refreshes = 0
+
+    def _fresh_header(self):
+        """The cached header if it is still fresh, else None; header and expiry are read together."""
+        with self._lock:
+            if self._header is not None and time.monotonic() < self._stale_at:
+                return self._header
+            return None
+
+    def authorization(self):
+        """Return the current ``Authorization`` header value, fetching a token first if needed."""
+        header = self._fresh_header()
+        if header is None:
+            with self._refresh_lock:
+                # Whoever held the lock before us may already have refreshed.
+                header = self._fresh_header() or self._refresh()
+        if self.background_refresh and self._refresher is None:
+            self._start_refresher()
+        return header
+
+    async def authorization_async(self):
+        """Async counterpart of authorization(); a token fetch runs in a worker thread."""
+        header = self._fresh_header()
+        if header is not None:
+            return header
+        return await asyncio.to_thread(self.authorization)
+
+    def invalidate(self, rejected_header):
+        """Drop the cached token if it is the one the server just rejected with a 401."""
+        with self._lock:
+            if rejected_header is not None and rejected_header == self._header:
+                self._stale_at = 0.0
+
+    def _refresh(self):
+        payload = {
+            "grant_type": "client_credentials",
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+        }
+        if self.scope:
+            payload["scope"] = self.scope
+        try:
+            response = requests.post(self.token_url, data=payload, timeout=self.timeout)
+            response.raise_for_status()
+            body = response.json()
+            token = body["access_token"]
+        except (requests.RequestException, ValueError, KeyError) as e:
+            raise TokenError(f"Could not obtain an access token from {self.token_url}: {e}") from e
+        lifetime = float(body.get("expires_in", 3600))
+        # Short-lived tokens would otherwise be stale the moment they arrive.
+        margin = min(self.refresh_margin, lifetime / 4)
+        now = time.monotonic()
+        with self._lock:
+            self._header = f"{body.get('token_type', 'Bearer').capitalize()} {token}"
+            self._stale_at = now + lifetime - margin
+            # The background thread renews one margin earlier still, so callers never have to wait.
+            self._refresh_at = now + max(lifetime / 2, lifetime - 2 * margin)
+            self.refreshes += 1
+            return self._header
+
+    def _start_refresher(self):
+        with self._lock:
+            if self._refresher is None:
+                self._refresher = threading.Thread(target=self._refresh_loop, name="token-refresh", daemon=True)
+                self._refresher.start()
+
+    def _refresh_loop(self):
+        retry_delay = 5
+        while not self._stop.wait(max(0.0, self._refresh_at - time.monotonic())):
+            if time.monotonic() < self._refresh_at:
+                continue  # A caller refreshed (or a 401 forced a refresh) while we slept.
+            try:
+                with self._refresh_lock:
+                    self._refresh()
+                retry_delay = 5
+            except TokenError as e:
+                logging.error(f"Background token refresh failed: {e}")
+                if self._stop.wait(retry_delay):
+                    return
+                retry_delay = min(retry_delay * 2, 60)
+
+    def close(self):
+        """Stop the background refresh thread."""
+        self._stop.set()